@@ -0,0 +1,31 @@
+"""Shared device setup for the example scripts."""
+
+import functools
+
+import meshtastic.serial_interface
+import meshdb
+
+
+@functools.cache
+def connect_and_resolve(db_base):
+    """Point meshdb at `db_base`, open the serial interface and resolve the connected node number.
+
+    Cached per `db_base`, so importing or re-running an example from a REPL
+    reuses the open interface instead of repeating the serial handshake.
+    Returns (interface, connected_node_num).
+    """
+    meshdb.set_default_db_path(db_base)
+    print(f"[meshdb] DB base set to: {db_base}")
+
+    # You can also use meshtastic.tcp_interface.TCPInterface(hostname="127.0.0.1:4403")
+    interface = meshtastic.serial_interface.SerialInterface()
+
+    # Resolve connected device node number; its NodeDB is synced into our local DB by the
+    # background writer, so call meshdb.flush_packets() before the first query that needs it
+    connected_node_num = meshdb.get_connected_device_node_num(interface, background=True)
+    if connected_node_num is None:
+        print("[meshdb] Warning: Could not resolve connected device node number; falling back to 0.")
+        connected_node_num = 0
+    else:
+        print(f"[meshdb] Connected device node number: {connected_node_num}")
+    return interface, connected_node_num
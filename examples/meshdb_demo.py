@@ -4,9 +4,10 @@ import json
 from typing import List
 from pubsub import pub
 
-import meshtastic.serial_interface
 import meshdb
 
+from _common import connect_and_resolve
+
 """
 Basic MeshDB integration demo
 =============================
@@ -50,27 +51,7 @@ TARGETS: List[object] = [
 DEMO_METRIC = os.environ.get("MESHDB_METRIC", "hw_model")  # e.g., "battery_level"
 
 # -----------------------------
-# 2) Configure MeshDB base path
-# -----------------------------
-meshdb.set_default_db_path(DB_BASE)
-print(f"[meshdb] DB base set to: {DB_BASE}")
-
-# -----------------------------
-# 3) Connect to device (Serial)
-# -----------------------------
-# You can also use meshtastic.tcp_interface.TCPInterface(hostname="127.0.0.1:4403")
-interface = meshtastic.serial_interface.SerialInterface()
-
-# Resolve connected device node number AND sync its NodeDB into our local DB
-CONNECTED_NODE_NUM = meshdb.get_connected_device_node_num(interface)
-if CONNECTED_NODE_NUM is None:
-    print("[meshdb] Warning: Could not resolve connected device node number; falling back to 0.")
-    CONNECTED_NODE_NUM = 0
-else:
-    print(f"[meshdb] Connected device node number: {CONNECTED_NODE_NUM}")
-
-# -----------------------------
-# 4) Helper to pretty print JSON
+# 2) Helper to pretty print JSON
 # -----------------------------
 
 
@@ -79,60 +60,78 @@ def jprint(obj):
 
 
 # -----------------------------
-# 5) Show resolution examples
-# -----------------------------
-print("\n=== Node number resolution examples ===")
-for ident in TARGETS:
-    resolved = meshdb.get_node_num(ident, owner_node_num=CONNECTED_NODE_NUM)
-    print(f"identifier= {ident!r} → node_num= {resolved}")
-
-# -----------------------------
-# 6) Show full snapshots for targets
-# -----------------------------
-print("\n=== Full node snapshots (nodeinfo + latest telemetry + latest position) ===")
-for ident in TARGETS:
-    snap = meshdb.get_node(ident, owner_node_num=CONNECTED_NODE_NUM)
-    if snap is None:
-        print(f"snapshot for {ident!r}: NOT FOUND")
-    else:
-        print(f"\n# snapshot for {ident!r}")
-        jprint(snap)
-
-# -----------------------------
-# 7) Show a single metric value (first-found subtype priority)
-# -----------------------------
-print("\n=== Single metric lookup ===")
-for ident in TARGETS:
-    val = meshdb.get_node_metric(ident, DEMO_METRIC, owner_node_num=CONNECTED_NODE_NUM)
-    print(f"{DEMO_METRIC} for {ident!r} → {val}")
-
-# Bonus: show a NodeInfo field via metric helper
-
-val = meshdb.get_node_metric("SenseRAT", "hw_model", owner_node_num=CONNECTED_NODE_NUM)
-print(f"hw_model for 'SenseRAT' → {val}")
-
-# -----------------------------
-# 8) Live receive: store packets and optionally observe
+# 3) Live receive: store packets and optionally observe
 # -----------------------------
 
 
 def on_receive(packet=None, interface=None):
     """Store NODEINFO/POSITION/TELEMETRY/TEXT_MESSAGE into the DB automatically."""
     try:
-        result = meshdb.handle_packet(packet, node_database_number=CONNECTED_NODE_NUM)
+        _, connected_node_num = connect_and_resolve(DB_BASE)
+
+        # Queue the packet: a background writer commits packets in batches, so this
+        # callback never blocks on disk. Names below reflect writes already flushed.
+        result = meshdb.handle_packet(packet, node_database_number=connected_node_num, flush=False)
 
         # Example: derive readable sender names
         sender = packet.get("from")
-        ln = meshdb.get_long_name(sender, node_database_number=CONNECTED_NODE_NUM)
-        sn = meshdb.get_short_name(sender, node_database_number=CONNECTED_NODE_NUM)
+        ln = meshdb.get_long_name(sender, node_database_number=connected_node_num)
+        sn = meshdb.get_short_name(sender, node_database_number=connected_node_num)
         print(f"saved={result} from={sender} long='{ln}' short='{sn}' port={packet.get('decoded',{}).get('portnum')}")
 
     except Exception as e:
         print(f"on_receive error: {e}")
 
 
-# Hook PubSub topic and idle forever
-pub.subscribe(on_receive, "meshtastic.receive")
-print("\n[meshdb] Listening for packets… (Ctrl+C to exit)")
-while True:
-    time.sleep(1)
+def main():
+    # -----------------------------
+    # 4) Configure MeshDB and connect to device (Serial)
+    # -----------------------------
+    _, connected_node_num = connect_and_resolve(DB_BASE)
+    # Wait for the startup NodeDB sync before querying it
+    meshdb.flush_packets()
+
+    # -----------------------------
+    # 5) Show resolution examples
+    # -----------------------------
+    # Load the node list once and resolve every target from memory
+    print("\n=== Node number resolution examples ===")
+    index = meshdb.build_name_index(connected_node_num)
+    for ident in TARGETS:
+        resolved = meshdb.lookup_node_num(index, ident)
+        print(f"identifier= {ident!r} → node_num= {resolved}")
+
+    # -----------------------------
+    # 6) Show full snapshots for targets
+    # -----------------------------
+    print("\n=== Full node snapshots (nodeinfo + latest telemetry + latest position) ===")
+    for ident in TARGETS:
+        snap = meshdb.get_node(ident, owner_node_num=connected_node_num)
+        if snap is None:
+            print(f"snapshot for {ident!r}: NOT FOUND")
+        else:
+            print(f"\n# snapshot for {ident!r}")
+            jprint(snap)
+
+    # -----------------------------
+    # 7) Show a single metric value (first-found subtype priority)
+    # -----------------------------
+    print("\n=== Single metric lookup ===")
+    for ident in TARGETS:
+        val = meshdb.get_node_metric(ident, DEMO_METRIC, owner_node_num=connected_node_num)
+        print(f"{DEMO_METRIC} for {ident!r} → {val}")
+
+    # Bonus: show a NodeInfo field via metric helper
+
+    val = meshdb.get_node_metric("SenseRAT", "hw_model", owner_node_num=connected_node_num)
+    print(f"hw_model for 'SenseRAT' → {val}")
+
+    # Hook PubSub topic and idle forever
+    pub.subscribe(on_receive, "meshtastic.receive")
+    print("\n[meshdb] Listening for packets… (Ctrl+C to exit)")
+    while True:
+        time.sleep(1)
+
+
+if __name__ == "__main__":
+    main()
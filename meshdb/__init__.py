@@ -1,6 +1,7 @@
 from .db_handler import (
     set_default_db_path,
     handle_packet,
+    flush_packets,
     get_long_name,
     get_short_name,
     get_connected_device_node_num,
@@ -13,5 +14,9 @@ from .db_lookup import (
     get_node_num,
     get_nodeinfo,
     get_node,
+    iter_nodes,
     get_node_metric,
+    get_node_metrics,
+    build_name_index,
+    lookup_node_num,
 )
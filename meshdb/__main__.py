@@ -14,8 +14,11 @@ from __future__ import annotations
 import os
 import re
 import json
-from datetime import datetime
-from typing import Optional, Dict, Any
+import sys
+import textwrap
+from contextlib import closing
+from itertools import chain
+from typing import Dict, Any, Iterable, Iterator
 
 from meshdb import (
     NodeDB,
@@ -23,78 +26,101 @@ from meshdb import (
     TelemetryDB,
     set_default_db_path,
 )
-
-
-def _fmt_ts(ts: Optional[int]) -> str:
-    if not ts:
-        return "-"
-    try:
-        return datetime.fromtimestamp(int(ts)).strftime("%Y-%m-%d %H:%M:%S")
-    except Exception:
-        return str(ts)
-
-
-def _latest_location(ldb: LocationDB, node_num: int) -> Optional[Dict[str, Any]]:
-    with ldb.connect() as con:
-        cur = con.cursor()
-        cur.execute(
-            f"SELECT timestamp, latitude, longitude, altitude, location_source FROM {ldb.table} "
-            "WHERE node_num = ? ORDER BY timestamp DESC LIMIT 1",
-            (node_num,),
-        )
-        row = cur.fetchone()
-        if not row:
-            return None
-        return {
-            "timestamp": row[0],
-            "latitude": row[1],
-            "longitude": row[2],
-            "altitude": row[3],
-            "location_source": row[4],
-        }
-
-
-def _latest_device_telemetry(tdb: TelemetryDB, node_num: int) -> Optional[Dict[str, Any]]:
-    with tdb.connect() as con:
-        cur = con.cursor()
-        cur.execute(
-            f"SELECT timestamp, battery_level, voltage, channel_utilization, air_util_tx, uptime_seconds "
-            f"FROM {tdb.table_device} WHERE node_num = ? ORDER BY timestamp DESC LIMIT 1",
-            (node_num,),
-        )
-        row = cur.fetchone()
-        if not row:
-            return None
-        return {
-            "timestamp": row[0],
-            "battery": row[1],
-            "voltage": row[2],
-            "ch_util": row[3],
-            "air_util": row[4],
-            "uptime": row[5],
+from meshdb.utils import decimal_to_hex
+
+# Per-owner DB filenames:
+#   12345678.db
+#   something.12345678.sqlite3
+#   something.12345678.db
+#   12345678.sqlite3
+_OWNER_RE = re.compile(r"(?:^|\.)(\d{4,})\.(?:db|sqlite3)\Z")
+_DB_SUFFIXES = (".db", ".sqlite3")
+
+
+# Column -> output key projections for the summarized telemetry/location views.
+_LOCATION_COLUMNS = {
+    "timestamp": "timestamp",
+    "latitude": "latitude",
+    "longitude": "longitude",
+    "altitude": "altitude",
+    "location_source": "location_source",
+}
+_DEVICE_COLUMNS = {
+    "timestamp": "timestamp",
+    "battery_level": "battery",
+    "voltage": "voltage",
+    "channel_utilization": "ch_util",
+    "air_util_tx": "air_util",
+    "uptime_seconds": "uptime",
+}
+_POWER_COLUMNS = {
+    "timestamp": "timestamp",
+    "ch1_voltage": "ch1_v",
+    "ch1_current": "ch1_i",
+    "ch2_voltage": "ch2_v",
+    "ch2_current": "ch2_i",
+    "ch3_voltage": "ch3_v",
+    "ch3_current": "ch3_i",
+}
+
+
+def _latest_by_node(cur, table: str, columns: Dict[str, str]) -> Dict[int, Dict[str, Any]]:
+    """Return {node_num: row} for every node in `table` using a single query.
+
+    Location and telemetry tables keep one (latest) row per node, enforced by
+    their unique node_num index, so a plain scan yields the latest rows.
+    `columns` maps column names to output keys and is selected explicitly,
+    with renames done by SQL aliases. Rows come back as plain tuples and are
+    zipped with the output keys, which skips building a `sqlite3.Row` per row;
+    the caller's cursor is reused across tables.
+    """
+    select = ", ".join(col if col == key else f"{col} AS {key}" for col, key in columns.items())
+    cur.execute(f"SELECT node_num, {select} FROM {table}")
+    keys = tuple(columns.values())
+    out: Dict[int, Dict[str, Any]] = {}
+    for node_num, *values in cur:
+        try:
+            out[int(node_num)] = dict(zip(keys, values))
+        except (TypeError, ValueError):
+            continue
+    return out
+
+
+def _node_summaries(rows, latest: Dict[str, Dict[int, Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+    """Yield one summary dict per node row, attaching each available latest view.
+
+    Names come straight from the node rows; a missing name falls back to the
+    node's hex id, as NodeDB.get_name would, without a lookup per node.
+    """
+    for node_num, long_name, short_name, last_heard, hops_away, snr in rows:
+        uid = int(node_num) if isinstance(node_num, (int, str)) else node_num
+        name_long = long_name or decimal_to_hex(uid)
+        name_short = short_name or decimal_to_hex(uid)
+        node_data = {
+            "node_num": uid,
+            "long_name": name_long,
+            "short_name": name_short,
+            "last_heard": last_heard,
+            "hops_away": hops_away,
+            "snr": snr,
         }
+        for key, by_node in latest.items():
+            row = by_node.get(uid)
+            if row:
+                node_data[key] = row
+        yield node_data
 
 
-def _latest_power_telemetry(tdb: TelemetryDB, node_num: int) -> Optional[Dict[str, Any]]:
-    with tdb.connect() as con:
-        cur = con.cursor()
-        cur.execute(
-            f"SELECT timestamp, ch1_voltage, ch1_current, ch2_voltage, ch2_current, ch3_voltage, ch3_current "
-            f"FROM {tdb.table_power} WHERE node_num = ? ORDER BY timestamp DESC LIMIT 1",
-            (node_num,),
-        )
-        row = cur.fetchone()
-        if not row:
-            return None
-        return {
-            "timestamp": row[0],
-            "ch1_v": row[1],
-            "ch1_i": row[2],
-            "ch2_v": row[3],
-            "ch2_i": row[4],
-            "ch3_v": row[5],
-            "ch3_i": row[6],
-        }
+def _write_json_array(items: Iterable[Dict[str, Any]]) -> None:
+    """Stream `items` to stdout, formatted exactly like json.dumps(list(items), indent=2)."""
+    out = sys.stdout
+    out.write("[")
+    sep = "\n"
+    for item in items:
+        out.write(sep)
+        out.write(textwrap.indent(json.dumps(item, indent=2), "  "))
+        sep = ",\n"
+    out.write("]\n" if sep == "\n" else "\n]\n")
 
 
 def _infer_owner_candidates(db_hint: str | None) -> list[int]:
@@ -105,13 +131,10 @@ def _infer_owner_candidates(db_hint: str | None) -> list[int]:
     dirpath = path if os.path.isdir(path) else (os.path.dirname(path) or ".")
     out: set[int] = set()
     try:
-        for fn in os.listdir(dirpath):
-            # Patterns:
-            #   12345678.db
-            #   something.12345678.sqlite3
-            #   something.12345678.db
-            #   12345678.sqlite3
-            m = re.search(r"(?:^|\.)((?:\d){4,})(?=\.(?:db|sqlite3)$)", fn)
+        with os.scandir(dirpath) as entries:
+            names = [e.name for e in entries if e.name.endswith(_DB_SUFFIXES)]
+        for fn in names:
+            m = _OWNER_RE.search(fn)
             if m:
                 try:
                     out.add(int(m.group(1)))
@@ -153,78 +176,41 @@ def start() -> None:
     ldb.ensure_table()
     tdb.ensure_tables()
 
-    # Fetch all nodes
-    with ndb.connect() as con:
+    # Node, location and telemetry tables live in the same per-owner file, so a
+    # single read-only connection serves the whole run, inside one read
+    # transaction so every query sees the same snapshot.
+    with closing(ndb.connect(read_only=True)) as con:
+        con.execute("BEGIN DEFERRED")
+
+        # Fetch all nodes
         cur = con.cursor()
         cur.execute(
             f"SELECT node_num, long_name, short_name, last_heard, hops_away, snr FROM {ndb.table} "
             "ORDER BY (last_heard IS NULL), last_heard DESC"
         )
-        rows = cur.fetchall()
+        first = cur.fetchone()
 
-    if not rows:
-        print("(no nodes in database)")
-        return
+        if first is None:
+            print("(no nodes in database)")
+            return
 
-    node_list = []
-    for node_num, long_name, short_name, last_heard, hops_away, snr in rows:
-        uid = int(node_num) if isinstance(node_num, (int, str)) else node_num
-        name_long = long_name or ndb.get_name(uid, "long")
-        name_short = short_name or ndb.get_name(uid, "short")
-        loc = _latest_location(ldb, uid)
-        dev = _latest_device_telemetry(tdb, uid)
-        pwr = _latest_power_telemetry(tdb, uid)
-        node_data = {
-            "node_num": uid,
-            "long_name": name_long,
-            "short_name": name_short,
-            "last_heard": last_heard,
-            "hops_away": hops_away,
-            "snr": snr,
+        # Latest position/telemetry for every node, one query per table. Uses its
+        # own cursor so the node rows keep streaming from `cur`.
+        scan = con.cursor()
+        latest = {
+            "location": _latest_by_node(scan, ldb.table, _LOCATION_COLUMNS),
+            "telemetry_device": _latest_by_node(scan, tdb.table_device, _DEVICE_COLUMNS),
+            "telemetry_power": _latest_by_node(scan, tdb.table_power, _POWER_COLUMNS),
         }
-        if loc:
-            node_data["location"] = loc
-        if dev:
-            node_data["telemetry_device"] = dev
-        if pwr:
-            node_data["telemetry_power"] = pwr
-
-        with tdb.connect() as con:
-            cur = con.cursor()
-            # Environment telemetry
-            cur.execute(
-                f"SELECT * FROM {tdb.table_environment} WHERE node_num = ? ORDER BY timestamp DESC LIMIT 1", (uid,)
-            )
-            env_row = cur.fetchone()
-            if env_row:
-                columns = [d[0] for d in cur.description]
-                node_data["telemetry_environment"] = dict(zip(columns, env_row))
-
-            # Air quality telemetry
-            cur.execute(
-                f"SELECT * FROM {tdb.table_air_quality} WHERE node_num = ? ORDER BY timestamp DESC LIMIT 1", (uid,)
-            )
-            aq_row = cur.fetchone()
-            if aq_row:
-                columns = [d[0] for d in cur.description]
-                node_data["telemetry_air_quality"] = dict(zip(columns, aq_row))
-
-            # Health telemetry
-            cur.execute(f"SELECT * FROM {tdb.table_health} WHERE node_num = ? ORDER BY timestamp DESC LIMIT 1", (uid,))
-            health_row = cur.fetchone()
-            if health_row:
-                columns = [d[0] for d in cur.description]
-                node_data["telemetry_health"] = dict(zip(columns, health_row))
-
-            # Host telemetry
-            cur.execute(f"SELECT * FROM {tdb.table_host} WHERE node_num = ? ORDER BY timestamp DESC LIMIT 1", (uid,))
-            host_row = cur.fetchone()
-            if host_row:
-                columns = [d[0] for d in cur.description]
-                node_data["telemetry_host"] = dict(zip(columns, host_row))
-
-        node_list.append(node_data)
-    print(json.dumps(node_list, indent=2))
+        for key, table in (
+            ("telemetry_environment", tdb.table_environment),
+            ("telemetry_air_quality", tdb.table_air_quality),
+            ("telemetry_health", tdb.table_health),
+            ("telemetry_host", tdb.table_host),
+        ):
+            latest[key] = _latest_by_node(scan, table, {col: col for col in tdb.columns[table]})
+
+        _write_json_array(_node_summaries(chain((first,), cur), latest))
 
 
 if __name__ == "__main__":
@@ -1,5 +1,5 @@
 import os
-from typing import Optional, Union, Dict, List, Tuple
+from typing import Optional, Union, Dict, Iterable, Iterator, List, Tuple
 
 # Optional package-wide default DB base path that users can set from their scripts.
 # If set (via set_default_db_path), classes will use it when db_path=None.
@@ -13,15 +13,30 @@ def set_default_db_path(path: Optional[str]) -> None:
         set_default_db_path("~/db")
         set_default_db_path("./data/mesh.sqlite3")
         set_default_db_path(None)  # disable and use cwd
+
+    The path is resolved to an absolute path here, once, so relative paths
+    are taken relative to the current directory at the time of the call.
     """
     global DEFAULT_DB_BASE_PATH
-    DEFAULT_DB_BASE_PATH = os.path.expanduser(path) if path else None
+    DEFAULT_DB_BASE_PATH = os.path.abspath(os.path.expanduser(path)) if path else None
+    # Directories may have been created since paths were last resolved
+    _cached_db_path.cache_clear()
+    _cached_db.cache_clear()
+    # Drop idle handles (and data_version watches) on files the old default pointed at
+    _close_idle()
 
 
 import sqlite3
 import time
 import logging
-from datetime import datetime
+import queue
+import atexit
+import pathlib
+import functools
+import itertools
+import operator
+import threading
+from contextlib import contextmanager
 
 from meshdb.utils import decimal_to_hex
 
@@ -42,14 +57,26 @@ def _default_db_path(base_path: Optional[str], node_database_number: Union[int,
     `.<owner>` to its filename. If base_path is None, use current dir.
     """
     # If a per-call base_path was not provided, fall back to the package-wide default
-    # that users may set via set_default_db_path().
+    # that users may set via set_default_db_path(). That default is stored already
+    # resolved, so only per-call paths go through expanduser/abspath here.
+    owner = str(node_database_number)
     if base_path is None and DEFAULT_DB_BASE_PATH:
         base_path = DEFAULT_DB_BASE_PATH
-    owner = str(node_database_number)
-    if not base_path:
+    elif not base_path:
         return os.path.abspath(f"{owner}.db")
+    elif not (os.path.isabs(base_path) or base_path.startswith("~")):
+        # Relative to the current directory, which may change between calls: don't cache
+        return _db_path_for(os.path.abspath(base_path), owner)
+    return _cached_db_path(base_path, owner)
+
 
-    base_path = os.path.abspath(os.path.expanduser(base_path))
+@functools.lru_cache(maxsize=1024)
+def _cached_db_path(base_path: str, owner: str) -> str:
+    """_db_path_for() for absolute or ~ paths, remembered so each handler skips the stat calls."""
+    return _db_path_for(os.path.abspath(os.path.expanduser(base_path)), owner)
+
+
+def _db_path_for(base_path: str, owner: str) -> str:
     if os.path.isdir(base_path):
         return os.path.join(base_path, f"{owner}.db")
 
@@ -59,6 +86,466 @@ def _default_db_path(base_path: Optional[str], node_database_number: Union[int,
     return f"{base_path}.{owner}.sqlite3"
 
 
+@functools.lru_cache(maxsize=1024)
+def _make_parent_dir(path: str) -> None:
+    """Create `path`'s directory once per process (failures are not cached)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+
+# Per-thread write batch: while a batch is open, every write on that thread
+# shares one connection (and one transaction) per database file.
+_BATCH = threading.local()
+
+# Tables whose DDL has already been applied, keyed by (db_path, table). The value
+# is whatever ensure_* wants to reuse on later calls (TelemetryDB keeps its column
+# names here). Tables created inside a write batch are only recorded once it commits.
+_ENSURED: Dict[Tuple[str, str], object] = {}
+
+
+# Idle connections, keyed by (db_path, read_only). Every _DB instance for the same
+# file (one per owner and table kind) borrows from the same pool instead of opening
+# its own connection; at most _POOL_SIZE idle connections are kept per key, plus
+# one per thread (see _checkin).
+_POOL: Dict[Tuple[str, bool], queue.LifoQueue] = {}
+_POOL_LOCK = threading.Lock()
+_POOL_SIZE = 4
+
+
+def set_pool_size(size: int) -> None:
+    """Cap the number of idle connections shared per database file (0 disables pooling)."""
+    global _POOL_SIZE
+    _POOL_SIZE = max(0, int(size))
+
+
+# Each thread first reuses the last connection it returned for a key, so a
+# receive loop keeps hitting the same handle without touching the shared pool.
+_TL = threading.local()
+
+# Read-only connections that only run PRAGMA data_version, one per thread and file
+# (see _DB.data_version). They live in _TL.watches; this set lets _close_idle()
+# close them from any thread. Guarded by _POOL_LOCK.
+_WATCHES: set = set()
+_WATCH_SERIAL = itertools.count()
+
+
+def _checkout(db_path: str, read_only: bool = False) -> Optional[sqlite3.Connection]:
+    """Pop an idle connection for `db_path`, or None if there is none.
+
+    This thread's own idle connection comes first, then the shared pool.
+    """
+    key = (db_path, read_only)
+    mine = getattr(_TL, "conns", None)
+    if mine:
+        con = mine.pop(key, None)
+        if con is not None:
+            return con
+    pool = _POOL.get(key)
+    if pool is None:
+        return None
+    try:
+        return pool.get_nowait()
+    except queue.Empty:
+        return None
+
+
+def _checkin(db_path: str, con: sqlite3.Connection, read_only: bool = False) -> None:
+    """Keep `con` for this thread, or return it to the pool, closing it if the pool is full."""
+    if con.in_transaction:
+        con.rollback()
+    key = (db_path, read_only)
+    mine = getattr(_TL, "conns", None)
+    if mine is None:
+        mine = _TL.conns = {}
+    if key not in mine and _POOL_SIZE:
+        mine[key] = con
+        return
+    with _POOL_LOCK:
+        pool = _POOL.setdefault(key, queue.LifoQueue())
+        if pool.qsize() < _POOL_SIZE:
+            pool.put_nowait(con)
+            return
+    con.close()
+
+
+def _close_idle() -> None:
+    """Close every idle pooled connection, this thread's own idle ones, and all data_version watches."""
+    idle = list(getattr(_TL, "conns", {}).values())
+    _TL.conns = {}
+    _TL.watches = {}
+    with _POOL_LOCK:
+        for pool in _POOL.values():
+            while not pool.empty():
+                idle.append(pool.get_nowait())
+        _POOL.clear()
+        # Other threads notice theirs are closed on next use and reopen them
+        idle.extend(_WATCHES)
+        _WATCHES.clear()
+    for con in idle:
+        try:
+            con.close()
+        except sqlite3.Error:
+            pass
+
+
+# Registered before the background writer's join, so it runs after pending writes drain.
+atexit.register(_close_idle)
+
+
+@contextmanager
+def _write_batch():
+    """Group all writes made on this thread into one transaction per DB file.
+
+    Commits on exit (rolls back on error). Nested batches join the outer one.
+    Upserts queued in _BATCH.rows ({(connection, statement): {node_num: params}})
+    are written with one executemany per statement just before the commit.
+    """
+    if getattr(_BATCH, "connections", None) is not None:
+        yield
+        return
+    connections: Dict[str, sqlite3.Connection] = {}
+    ensured: Dict[Tuple[str, str], object] = {}
+    rows: Dict[Tuple[sqlite3.Connection, str], Dict[object, tuple]] = {}
+    _BATCH.connections, _BATCH.ensured, _BATCH.rows = connections, ensured, rows
+    ok = False
+    try:
+        yield
+        for (con, sql), queued in rows.items():
+            _executemany_rows(con, sql, list(queued.values()))
+        ok = True
+    finally:
+        _BATCH.connections = _BATCH.ensured = _BATCH.rows = None
+        for path, con in connections.items():
+            try:
+                if ok:
+                    con.commit()
+                else:
+                    con.rollback()
+            finally:
+                _checkin(path, con)
+        if ok:
+            _ENSURED.update(ensured)
+
+
+def _executemany_rows(con: sqlite3.Connection, sql: str, rows: List[tuple]) -> None:
+    """executemany `rows`; if one is rejected, redo them one at a time so only bad rows are dropped."""
+    con.execute("SAVEPOINT meshdb_rows")
+    try:
+        con.executemany(sql, rows)
+    except sqlite3.Error:
+        con.execute("ROLLBACK TO meshdb_rows")
+        for params in rows:
+            try:
+                con.execute(sql, params)
+            except sqlite3.Error as e:
+                logging.error(f"Dropping row {params!r}: {e}")
+    con.execute("RELEASE meshdb_rows")
+
+
+# Files this process has already switched to WAL (see _configure).
+_WAL_FILES: set = set()
+
+
+def _configure(con: sqlite3.Connection, db_path: str, *, read_only: bool = False) -> sqlite3.Connection:
+    """Apply the PRAGMAs every DB handle uses.
+
+    WAL lets readers (e.g. the CLI) run while the receiver writes, and with
+    synchronous=NORMAL a commit no longer waits on fsync; only checkpoints do.
+    The journal mode is stored in the file, so it is set by the first write
+    connection to each file and skipped afterwards; read-only connections leave
+    it alone. A brand-new file also gets 8 KiB pages and incremental auto-vacuum,
+    which can only be chosen before the first table exists; see _DB.maintain().
+    The remaining PRAGMAs are per connection.
+    """
+    if not read_only:
+        if db_path not in _WAL_FILES:
+            if con.execute("PRAGMA page_count").fetchone()[0] == 0:
+                con.execute("PRAGMA page_size=8192")
+                con.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            con.execute("PRAGMA journal_mode=WAL")
+            _WAL_FILES.add(db_path)
+        con.execute("PRAGMA synchronous=NORMAL")
+    con.execute("PRAGMA temp_store=MEMORY")
+    con.execute("PRAGMA cache_size=-10000")
+    con.execute("PRAGMA mmap_size=268435456")
+    return con
+
+
+def _chunked(items: Iterable, size: Optional[int]) -> Iterator[list]:
+    """Yield `items` in lists of `size` (all of them in one list when size is falsy)."""
+    it = iter(items)
+    while True:
+        chunk = list(itertools.islice(it, size)) if size else list(it)
+        if not chunk:
+            return
+        yield chunk
+
+
+# Bound parameters per statement on SQLite builds older than 3.32 (SQLITE_MAX_VARIABLE_NUMBER).
+_MAX_SQL_VARIABLES = 999
+
+
+def _rows_by_node(cur: sqlite3.Cursor, table: str, node_nums: List[Union[int, str]]) -> Dict[int, Dict[str, object]]:
+    """Return {node_num: row as a dict} for `node_nums`, with one IN (...) query per chunk of nodes.
+
+    Every per-node table has a unique node_num index, so each node has at most one
+    row and the lookup is an index search with nothing to sort.
+    """
+    out: Dict[int, Dict[str, object]] = {}
+    for chunk in _chunked(node_nums, _MAX_SQL_VARIABLES):
+        cur.execute(f"SELECT * FROM {table} WHERE node_num IN ({', '.join('?' * len(chunk))})", chunk)
+        cols = [d[0] for d in cur.description]
+        for row in cur:
+            rec = dict(zip(cols, row))
+            try:
+                out[int(rec["node_num"])] = rec
+            except (TypeError, ValueError):
+                continue
+    return out
+
+
+# Column order for the per-node upserts in LocationDB/TelemetryDB.save_packet.
+_LOCATION_COLUMNS: Tuple[str, ...] = (
+    "node_num",
+    "timestamp",
+    "latitude",
+    "longitude",
+    "latitude_i",
+    "longitude_i",
+    "altitude",
+    "location_source",
+    "altitude_source",
+    "pos_time",
+    "pos_timestamp",
+    "pos_timestamp_ms_adjust",
+    "altitude_hae",
+    "altitude_geoidal_separation",
+    "pdop",
+    "hdop",
+    "vdop",
+    "gps_accuracy",
+    "ground_speed",
+    "ground_track",
+    "fix_quality",
+    "fix_type",
+    "sats_in_view",
+    "sensor_id",
+    "next_update",
+    "seq_number",
+    "precision_bits",
+    "precision",
+)
+# Accepted spellings (camelCase and snake_case decoders) for each position column
+# after node_num/timestamp, in _LOCATION_COLUMNS order; precision reuses precision_bits.
+_POSITION_FIELDS: Tuple[Tuple[str, ...], ...] = (
+    ("latitude", "lat"),
+    ("longitude", "lon"),
+    ("latitudeI", "latitude_i"),
+    ("longitudeI", "longitude_i"),
+    ("altitude", "alt"),
+    ("locationSource", "location_source"),
+    ("altitudeSource", "altitude_source"),
+    ("time", "pos_time"),
+    ("timestamp", "pos_timestamp"),
+    ("timestampMillisAdjust", "timestamp_millis_adjust", "pos_timestamp_ms_adjust"),
+    ("altitudeHae", "altitude_hae"),
+    ("altitudeGeoidalSeparation", "altitude_geoidal_separation"),
+    ("PDOP", "pdop"),
+    ("HDOP", "hdop"),
+    ("VDOP", "vdop"),
+    ("gpsAccuracy", "gps_accuracy"),
+    ("groundSpeed", "ground_speed"),
+    ("groundTrack", "ground_track"),
+    ("fixQuality", "fix_quality"),
+    ("fixType", "fix_type"),
+    ("satsInView", "sats_in_view"),
+    ("sensorId", "sensor_id"),
+    ("nextUpdate", "next_update"),
+    ("seqNumber", "seq_number"),
+    ("precisionBits", "precision_bits"),
+)
+_TELEMETRY_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "device": (
+        "node_num",
+        "timestamp",
+        "battery_level",
+        "voltage",
+        "channel_utilization",
+        "air_util_tx",
+        "uptime_seconds",
+    ),
+    "power": (
+        "node_num",
+        "timestamp",
+        "ch1_voltage",
+        "ch1_current",
+        "ch2_voltage",
+        "ch2_current",
+        "ch3_voltage",
+        "ch3_current",
+        "ch4_voltage",
+        "ch4_current",
+        "ch5_voltage",
+        "ch5_current",
+        "ch6_voltage",
+        "ch6_current",
+        "ch7_voltage",
+        "ch7_current",
+        "ch8_voltage",
+        "ch8_current",
+    ),
+    "environment": (
+        "node_num",
+        "timestamp",
+        "temperature",
+        "relative_humidity",
+        "barometric_pressure",
+        "gas_resistance",
+        "voltage",
+        "current",
+        "iaq",
+        "distance",
+        "lux",
+        "white_lux",
+        "ir_lux",
+        "uv_lux",
+        "wind_direction",
+        "wind_speed",
+        "weight",
+        "wind_gust",
+        "wind_lull",
+        "radiation",
+        "rainfall_1h",
+        "rainfall_24h",
+        "soil_moisture",
+        "soil_temperature",
+    ),
+    "air_quality": (
+        "node_num",
+        "timestamp",
+        "pm10_standard",
+        "pm25_standard",
+        "pm100_standard",
+        "pm10_environmental",
+        "pm25_environmental",
+        "pm100_environmental",
+        "particles_03um",
+        "particles_05um",
+        "particles_10um",
+        "particles_25um",
+        "particles_50um",
+        "particles_100um",
+        "co2",
+        "co2_temperature",
+        "co2_humidity",
+        "form_formaldehyde",
+        "form_humidity",
+        "form_temperature",
+        "pm40_standard",
+        "particles_40um",
+        "pm_temperature",
+        "pm_humidity",
+        "pm_voc_idx",
+        "pm_nox_idx",
+        "particles_tps",
+    ),
+    "local_stats": (
+        "node_num",
+        "timestamp",
+        "uptime_seconds",
+        "channel_utilization",
+        "air_util_tx",
+        "num_packets_tx",
+        "num_packets_rx",
+        "num_packets_rx_bad",
+        "num_online_nodes",
+        "num_total_nodes",
+        "num_rx_dupe",
+        "num_tx_relay",
+        "num_tx_relay_canceled",
+        "heap_total_bytes",
+        "heap_free_bytes",
+        "num_tx_dropped",
+    ),
+    "health": (
+        "node_num",
+        "timestamp",
+        "heart_bpm",
+        "spO2",
+        "temperature",
+    ),
+    "host": (
+        "node_num",
+        "timestamp",
+        "uptime_seconds",
+        "freemem_bytes",
+        "diskfree1_bytes",
+        "diskfree2_bytes",
+        "diskfree3_bytes",
+        "load1",
+        "load5",
+        "load15",
+        "user_string",
+    ),
+}
+
+
+def _json_name(field: str) -> str:
+    """protobuf's JSON (camelCase) name for a snake_case field: rainfall_1h -> rainfall1h."""
+    head, *rest = field.split("_")
+    return head + "".join(part[:1].upper() + part[1:] for part in rest)
+
+
+# Telemetry payload key(s) per subtype, tried in order like `a or b`, and the
+# (camelCase, snake_case) spelling of each column after node_num/timestamp.
+# Derived once here so packets are read without rebuilding either spelling.
+_TELEMETRY_KEYS: Dict[str, Tuple[str, ...]] = {
+    "device": ("deviceMetrics",),
+    "power": ("powerMetrics",),
+    "environment": ("environmentMetrics", "environment_metrics"),
+    "air_quality": ("airQualityMetrics", "air_quality_metrics"),
+    "local_stats": ("localStats", "local_stats"),
+    "health": ("healthMetrics", "health_metrics"),
+    "host": ("hostMetrics", "host_metrics"),
+}
+_TELEMETRY_KEY_SUBTYPES: Dict[str, str] = {key: subtype for subtype, keys in _TELEMETRY_KEYS.items() for key in keys}
+_TELEMETRY_FIELDS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    subtype: tuple((_json_name(col), col) for col in columns[2:]) for subtype, columns in _TELEMETRY_COLUMNS.items()
+}
+# Fast path for payloads with no snake_case-only keys (what MessageToDict emits):
+# merge over all-None defaults and project every column at once with an itemgetter.
+# Per subtype: (getter, defaults, snake_case names that differ from their camelCase).
+_TELEMETRY_GETTERS: Dict[str, Tuple[operator.itemgetter, Dict[str, None], frozenset]] = {
+    subtype: (
+        operator.itemgetter(*(camel for camel, _ in fields)),
+        dict.fromkeys(camel for camel, _ in fields),
+        frozenset(snake for camel, snake in fields if snake != camel),
+    )
+    for subtype, fields in _TELEMETRY_FIELDS.items()
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _upsert_sql(table: str, columns: Tuple[str, ...]) -> str:
+    """INSERT a row keyed by node_num, overwriting every other column on conflict.
+
+    A row identical to the stored one (e.g. the same packet ingested twice) is
+    left alone, so it dirties no pages. Built once per (table, columns); the
+    identical text also keeps hitting sqlite3's per-connection statement cache.
+    """
+    updated = [col for col in columns if col != "node_num"]
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+        f"ON CONFLICT(node_num) DO UPDATE SET "
+        + ", ".join(f"{col}=excluded.{col}" for col in updated)
+        + f" WHERE ({', '.join(updated)}) IS NOT ({', '.join(f'excluded.{col}' for col in updated)})"
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _format_sql(template: str, table: str) -> str:
+    return template.format(table=table)
+
+
 class _DB:
     """Lightweight connection helper that ensures tables and provides cursors."""
 
@@ -66,24 +553,155 @@ class _DB:
         self.node_database_number = int(node_database_number)
         self.db_path = _default_db_path(db_path, self.node_database_number)
         # Ensure parent directory exists if a directory is implied
-        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        _make_parent_dir(self.db_path)
+
+    def _open(self, read_only: bool = False, isolation_level: Optional[str] = None) -> sqlite3.Connection:
+        if read_only:
+            # Autocommit (no implicit transactions); callers may BEGIN once for a consistent snapshot.
+            # Not tied to the opening thread: _checkin may hand it to another thread through the pool.
+            con = sqlite3.connect(
+                f"{pathlib.Path(self.db_path).as_uri()}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+                cached_statements=256,
+                isolation_level=None,
+            )
+            return _configure(con, self.db_path, read_only=True)
+        # Autocommit by default as well: transaction() and write batches issue BEGIN IMMEDIATE/COMMIT themselves.
+        con = sqlite3.connect(
+            self.db_path, check_same_thread=False, cached_statements=256, isolation_level=isolation_level
+        )
+        return _configure(con, self.db_path)
+
+    def connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """Open a new configured connection to this file; it belongs to the caller, who closes it.
+
+        Write connections use sqlite3's default isolation level, so `with con:`
+        commits the statements inside it or rolls them back on error. Internal
+        reads and writes borrow autocommit connections from the shared pool instead.
+        """
+        if read_only:
+            return self._open(read_only=True)
+        return self._open(isolation_level="")
 
-    def connect(self):
-        return sqlite3.connect(self.db_path)
+    def data_version(self) -> Optional[Tuple[int, int]]:
+        """Return a token that changes whenever another connection commits to this file.
+
+        Wraps PRAGMA data_version, read on a read-only connection this thread keeps
+        open for the purpose; commits from this process and from other processes
+        both change it. Tokens are only comparable within one thread, so callers
+        keep per-thread caches keyed on them. Returns None if the file can't be read.
+        """
+        watches = getattr(_TL, "watches", None)
+        if watches is None:
+            watches = _TL.watches = {}
+        for _ in range(2):
+            entry = watches.get(self.db_path)
+            try:
+                if entry is None:
+                    # A fresh serial, so a reopened watch never repeats an old token
+                    entry = watches[self.db_path] = (self._open(read_only=True), next(_WATCH_SERIAL))
+                    with _POOL_LOCK:
+                        _WATCHES.add(entry[0])
+                return entry[1], entry[0].execute("PRAGMA data_version").fetchone()[0]
+            except sqlite3.ProgrammingError:
+                # Closed by _close_idle(); reopen once
+                watches.pop(self.db_path, None)
+            except sqlite3.Error:
+                watches.pop(self.db_path, None)
+                if entry is not None:
+                    with _POOL_LOCK:
+                        _WATCHES.discard(entry[0])
+                    entry[0].close()
+                return None
+        return None
+
+    @contextmanager
+    def borrow(self, read_only: bool = False):
+        """Lend a pooled connection for this file, returning it to the pool afterwards.
+
+        The connection is exclusive to the caller until the block exits.
+        Read-only connections (URI mode=ro, autocommit) are pooled separately;
+        under WAL they never take locks that hold up writers.
+        """
+        con = _checkout(self.db_path, read_only) or self._open(read_only)
+        try:
+            yield con
+        finally:
+            _checkin(self.db_path, con, read_only)
+
+    @contextmanager
+    def transaction(self):
+        """Yield a connection for writes inside an explicit BEGIN IMMEDIATE transaction.
+
+        Commits on exit (rolls back on error), unless a write batch is open on
+        this thread, in which case the batch's connection is shared and the
+        commit happens when the batch ends. Nested calls join the outer transaction.
+        """
+        with _write_batch():
+            batch = _BATCH.connections
+            con = batch.get(self.db_path)
+            if con is None:
+                con = _checkout(self.db_path) or self._open()
+                try:
+                    con.execute("BEGIN IMMEDIATE")
+                except BaseException:
+                    # e.g. SQLITE_BUSY: keep an autocommit connection out of the batch
+                    _checkin(self.db_path, con)
+                    raise
+                batch[self.db_path] = con
+            yield con
+
+    def maintain(self, pages: int = 100) -> None:
+        """Return up to `pages` free pages to the filesystem.
+
+        Only files created with incremental auto-vacuum shrink; for older
+        files this is a no-op. Cheap enough to call periodically.
+        """
+        with self.borrow() as con:
+            # execute() steps this pragma once (one page); executescript runs it to completion.
+            con.executescript(f"PRAGMA incremental_vacuum({int(pages)});")
+
+    def _ensured(self, table: str):
+        """Return what ensure_* recorded for `table` in this file, or None if it has not run."""
+        key = (self.db_path, table)
+        pending = getattr(_BATCH, "ensured", None)
+        if pending and key in pending:
+            return pending[key]
+        return _ENSURED.get(key)
+
+    def _mark_ensured(self, table: str, value: object = True) -> None:
+        pending = getattr(_BATCH, "ensured", None)
+        (_ENSURED if pending is None else pending)[(self.db_path, table)] = value
 
     @property
     def owner(self) -> int:
         return self.node_database_number
 
 
+# Stored node names, per thread and DB file: {db_path: (token, {(node_num, column): name})}.
+# Only names actually present in the DB are cached. The token comes from
+# _DB.data_version and changes on any commit to the file from another connection,
+# in this process or another one, which drops the file's cached names.
+_NAMES = threading.local()
+_NAME_CACHE_MAX = 4096
+
+
 class NodeDB(_DB):
     """CRUD utilities for the per-owner node database table (…_nodedb)."""
 
-    @property
-    def table(self) -> str:
-        return f'"{self.owner}_nodedb"'
+    def __init__(self, node_database_number: Union[int, str], db_path: Optional[str] = None):
+        super().__init__(node_database_number, db_path)
+        # Quoted once here; every statement interpolates it.
+        self.table = f'"{self.owner}_nodedb"'
+        # Name lookup per column, built once so get_name() reuses the same statement text.
+        self.sql_name: Dict[str, str] = {
+            col: f"SELECT {col} FROM {self.table} WHERE node_num = ?" for col in ("long_name", "short_name")
+        }
 
     def ensure_table(self) -> None:
+        if self._ensured(self.table):
+            return
         schema = (
             "node_num TEXT PRIMARY KEY,"
             "long_name TEXT,"
@@ -98,12 +716,12 @@ class NodeDB(_DB):
             "hops_away INTEGER,"
             "snr REAL"
         )
-        with self.connect() as con:
+        with self.transaction() as con:
             cur = con.cursor()
             cur.execute(f"CREATE TABLE IF NOT EXISTS {self.table} ({schema})")
             # Forward-compat: add new columns if upgrading from older schema
             cur.execute(f"PRAGMA table_info({self.table})")
-            cols = {r[1] for r in cur.fetchall()}
+            cols = {r[1] for r in cur}
             for name, typ in [
                 ("macaddr", "TEXT"),
                 ("is_unmessagable", "INTEGER"),
@@ -114,7 +732,19 @@ class NodeDB(_DB):
             ]:
                 if name not in cols:
                     cur.execute(f"ALTER TABLE {self.table} ADD COLUMN {name} {typ}")
-            con.commit()
+            # Matches the "most recently heard first, never heard last" ordering so it
+            # can be read off the index instead of sorting the whole table.
+            cur.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{self.owner}_node_heard ON {self.table} "
+                "((last_heard IS NULL), last_heard DESC)"
+            )
+            # Case-insensitive name lookups (get_node_num) compare with NOCASE
+            for col in ("short_name", "long_name"):
+                cur.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_{self.owner}_node_{col}_nocase ON {self.table} "
+                    f"({col} COLLATE NOCASE)"
+                )
+        self._mark_ensured(self.table)
 
     def upsert(
         self,
@@ -133,129 +763,185 @@ class NodeDB(_DB):
     ) -> None:
         """Insert or update a node record, preserving unspecified fields."""
         self.ensure_table()
-        with self.connect() as con:
-            cur = con.cursor()
-            cur.execute(f"SELECT * FROM {self.table} WHERE node_num = ?", (node_num,))
-            existing = cur.fetchone()
-
-            if existing:
-                (
-                    _node_num,
-                    ex_long,
-                    ex_short,
-                    ex_mac,
-                    ex_hw,
-                    ex_role,
-                    ex_lic,
-                    ex_pub,
-                    ex_unmsg,
-                    ex_last,
-                    ex_hops,
-                    ex_snr,
-                ) = existing
-            else:
-                ex_long = ex_short = ex_mac = ex_hw = ex_role = ex_lic = ex_pub = ex_unmsg = ex_last = ex_hops = (
-                    ex_snr
-                ) = None
-
-            long_name = (
-                long_name
-                if long_name is not None
-                else (ex_long if ex_long is not None else "Meshtastic " + str(decimal_to_hex(node_num)[-4:]))
-            )
-            short_name = (
-                short_name
-                if short_name is not None
-                else (ex_short if ex_short is not None else str(decimal_to_hex(node_num)[-4:]))
-            )
-            macaddr = macaddr if macaddr is not None else (ex_mac if ex_mac is not None else "")
-            hw_model = str(hw_model) if hw_model is not None else (ex_hw if ex_hw is not None else "UNSET")
-            role = str(role) if role is not None else (ex_role if ex_role is not None else "CLIENT")
-            is_licensed = int(is_licensed) if is_licensed is not None else (ex_lic if ex_lic is not None else 0)
-            public_key = public_key if public_key is not None else (ex_pub if ex_pub is not None else "")
-            is_unmessagable = (
-                int(is_unmessagable) if is_unmessagable is not None else (ex_unmsg if ex_unmsg is not None else 0)
-            )
-            last_heard = last_heard if last_heard is not None else (ex_last if ex_last is not None else None)
-            hops_away = hops_away if hops_away is not None else (ex_hops if ex_hops is not None else None)
-            snr = snr if snr is not None else (ex_snr if ex_snr is not None else None)
-
-            upsert_sql = f"""
-                INSERT INTO {self.table}
-                    (node_num, long_name, short_name, macaddr, hw_model, role, is_licensed, public_key, is_unmessagable, last_heard, hops_away, snr)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(node_num) DO UPDATE SET
-                    long_name=excluded.long_name,
-                    short_name=excluded.short_name,
-                    macaddr=excluded.macaddr,
-                    hw_model=excluded.hw_model,
-                    role=excluded.role,
-                    is_licensed=excluded.is_licensed,
-                    public_key=excluded.public_key,
-                    is_unmessagable=excluded.is_unmessagable,
-                    last_heard=excluded.last_heard,
-                    hops_away=excluded.hops_away,
-                    snr=excluded.snr
-            """
-            cur.execute(
-                upsert_sql,
-                (
-                    node_num,
-                    long_name,
-                    short_name,
-                    macaddr,
-                    hw_model,
-                    role,
-                    is_licensed,
-                    public_key,
-                    is_unmessagable,
-                    last_heard,
-                    hops_away,
-                    snr,
-                ),
-            )
-            con.commit()
+        params = self._upsert_params(
+            node_num,
+            long_name=long_name,
+            short_name=short_name,
+            hw_model=hw_model,
+            role=role,
+            is_licensed=is_licensed,
+            public_key=public_key,
+            macaddr=macaddr,
+            is_unmessagable=is_unmessagable,
+            last_heard=last_heard,
+            hops_away=hops_away,
+            snr=snr,
+        )
+        with self.transaction() as con:
+            con.execute(_format_sql(self._UPSERT_SQL, self.table), params)
+
+    def touch(self, node_num: Union[int, str], last_heard: Optional[int] = None, snr: Optional[float] = None) -> None:
+        """Record that a node was heard, adding it if it is new.
+
+        Same effect as upsert(node_num, last_heard=..., snr=...). Inside a write
+        batch the update is queued instead, folded with any other touch of the
+        same node, and written with the batch's other touches in one executemany.
+        """
+        self.ensure_table()
+        params = self._upsert_params(node_num, last_heard=last_heard, snr=snr)
+        queued = getattr(_BATCH, "rows", None)
+        with self.transaction() as con:
+            sql = _format_sql(self._UPSERT_SQL, self.table)
+            if queued is None:
+                con.execute(sql, params)
+                return
+            pending = queued.setdefault((con, sql), {})
+            prev = pending.get(params[0])
+            # The upsert keeps stored values for NULL parameters; fold queued touches the same way.
+            pending[params[0]] = params if prev is None else tuple(q if p is None else p for p, q in zip(params, prev))
 
     def get_name(self, node_num: int, kind: str = "long") -> str:
         """Return long or short name; fallback to hex string when missing."""
-        self.ensure_table()
         col = "long_name" if kind == "long" else "short_name"
-        with self.connect() as con:
+        key = (int(node_num), col)
+        self.ensure_table()
+        # Read the token before the SELECT: a commit landing after it changes the
+        # token, so a name read just before that commit is dropped on the next call.
+        token = self.data_version()
+        files = getattr(_NAMES, "files", None)
+        if files is None:
+            files = _NAMES.files = {}
+        entry = files.get(self.db_path)
+        if entry is None or entry[0] != token or len(entry[1]) >= _NAME_CACHE_MAX:
+            entry = files[self.db_path] = (token, {})
+        cached = entry[1].get(key)
+        if cached is not None:
+            return cached
+        with self.borrow(read_only=True) as con:
             cur = con.cursor()
-            cur.execute(f"SELECT {col} FROM {self.table} WHERE node_num = ?", (node_num,))
+            cur.execute(self.sql_name[col], (node_num,))
             row = cur.fetchone()
-            return row[0] if row and row[0] else decimal_to_hex(node_num)
-
-    def init_from_interface_nodes(self, nodes: List[Dict[str, object]]) -> None:
-        """Initialize/populate the node table from an iterable of node dicts."""
-        for node in list(nodes):
-            self.upsert(
-                node_num=node.get("num"),
-                long_name=node.get("user", {}).get("longName", ""),
-                short_name=node.get("user", {}).get("shortName", ""),
-                macaddr=node.get("user", {}).get("macaddr", ""),
-                hw_model=node.get("user", {}).get("hwModel", ""),
-                role=node.get("user", {}).get("role", "CLIENT"),
-                is_licensed=(
-                    node.get("user", {}).get("isLicensed") if isinstance(node.get("user", {}), dict) else None
+            if not (row and row[0]):
+                return decimal_to_hex(node_num)
+        if token is not None:
+            entry[1][key] = row[0]
+        return row[0]
+
+    def rows_for_nodes(self, node_nums: Iterable[Union[int, str]]) -> Dict[int, Dict[str, object]]:
+        """Return {node_num: node row as a dict} for many nodes in one query."""
+        self.ensure_table()
+        with self.borrow(read_only=True) as con:
+            return _rows_by_node(con.cursor(), self.table, list(node_nums))
+
+    # Upsert that keeps "new value, else stored value, else default" per column in SQL,
+    # so callers never read the row first. Parameters are the 12 columns in order
+    # (NULL when not given) followed by the default long and short names.
+    _UPSERT_SQL = """
+        INSERT INTO {table}
+            (node_num, long_name, short_name, macaddr, hw_model, role, is_licensed, public_key, is_unmessagable, last_heard, hops_away, snr)
+        VALUES (
+            ?1, COALESCE(?2, ?13), COALESCE(?3, ?14), COALESCE(?4, ''), COALESCE(?5, 'UNSET'), COALESCE(?6, 'CLIENT'),
+            COALESCE(?7, 0), COALESCE(?8, ''), COALESCE(?9, 0), ?10, ?11, ?12
+        )
+        ON CONFLICT(node_num) DO UPDATE SET
+            long_name=COALESCE(?2, long_name, ?13),
+            short_name=COALESCE(?3, short_name, ?14),
+            macaddr=COALESCE(?4, macaddr, ''),
+            hw_model=COALESCE(?5, hw_model, 'UNSET'),
+            role=COALESCE(?6, role, 'CLIENT'),
+            is_licensed=COALESCE(?7, is_licensed, 0),
+            public_key=COALESCE(?8, public_key, ''),
+            is_unmessagable=COALESCE(?9, is_unmessagable, 0),
+            last_heard=COALESCE(?10, last_heard),
+            hops_away=COALESCE(?11, hops_away),
+            snr=COALESCE(?12, snr)
+    """
+
+    @staticmethod
+    def _upsert_params(
+        node_num: Union[int, str],
+        long_name: Optional[str] = None,
+        short_name: Optional[str] = None,
+        hw_model: Optional[Union[str, int]] = None,
+        role: Optional[Union[str, int]] = None,
+        is_licensed: Optional[Union[bool, int]] = None,
+        public_key: Optional[str] = None,
+        macaddr: Optional[str] = None,
+        is_unmessagable: Optional[Union[bool, int]] = None,
+        last_heard: Optional[int] = None,
+        hops_away: Optional[int] = None,
+        snr: Optional[float] = None,
+    ) -> tuple:
+        """Bind parameters for _UPSERT_SQL, with upsert()'s type coercions applied."""
+        # The default names are only read when a name is missing, so skip the
+        # hex formatting when the caller supplied both.
+        suffix = None
+        if long_name is None or short_name is None:
+            try:
+                suffix = f"{int(node_num):08x}"[-4:]  # last 4 digits of decimal_to_hex()
+            except (TypeError, ValueError):
+                pass  # no generated default names for non-numeric ids
+        return (
+            node_num,
+            long_name,
+            short_name,
+            macaddr,
+            str(hw_model) if hw_model is not None else None,
+            str(role) if role is not None else None,
+            int(is_licensed) if is_licensed is not None else None,
+            public_key,
+            int(is_unmessagable) if is_unmessagable is not None else None,
+            last_heard,
+            hops_away,
+            snr,
+            "Meshtastic " + suffix if suffix else None,
+            suffix,
+        )
+
+    def init_from_interface_nodes(self, nodes: Iterable[Dict[str, object]]) -> None:
+        """Initialize/populate the node table from an iterable of node dicts.
+
+        All nodes are written with one executemany in a single transaction.
+        """
+        rows = []
+        for node in nodes:
+            rows.append(
+                self._upsert_params(
+                    node_num=node.get("num"),
+                    long_name=node.get("user", {}).get("longName", ""),
+                    short_name=node.get("user", {}).get("shortName", ""),
+                    macaddr=node.get("user", {}).get("macaddr", ""),
+                    hw_model=node.get("user", {}).get("hwModel", ""),
+                    role=node.get("user", {}).get("role", "CLIENT"),
+                    is_licensed=(
+                        node.get("user", {}).get("isLicensed") if isinstance(node.get("user", {}), dict) else None
+                    )
+                    or node.get("user", {}).get("is_licensed"),
+                    public_key=node.get("user", {}).get("publicKey", ""),
+                    is_unmessagable=node.get("user", {}).get("isUnmessagable", 0),
+                    last_heard=node.get("lastHeard"),
+                    hops_away=node.get("hopsAway"),
+                    snr=node.get("snr"),
                 )
-                or node.get("user", {}).get("is_licensed"),
-                public_key=node.get("user", {}).get("publicKey", ""),
-                is_unmessagable=node.get("user", {}).get("isUnmessagable", 0),
-                last_heard=node.get("lastHeard"),
-                hops_away=node.get("hopsAway"),
-                snr=node.get("snr"),
             )
+        if not rows:
+            return
+        self.ensure_table()
+        with self.transaction() as con:
+            con.executemany(_format_sql(self._UPSERT_SQL, self.table), rows)
 
 
 class LocationDB(_DB):
     """Storage and retrieval for location packets."""
 
-    @property
-    def table(self) -> str:
-        return f'"{self.owner}_location"'
+    def __init__(self, node_database_number: Union[int, str], db_path: Optional[str] = None):
+        super().__init__(node_database_number, db_path)
+        # Quoted once here; every statement interpolates it.
+        self.table = f'"{self.owner}_location"'
 
     def ensure_table(self) -> None:
+        if self._ensured(self.table):
+            return
         schema = (
             "node_num TEXT,"
             "timestamp INTEGER,"  # packet rxTime fallback
@@ -286,7 +972,7 @@ class LocationDB(_DB):
             "precision_bits INTEGER,"  # field 23
             "precision INTEGER"  # legacy compatibility
         )
-        with self.connect() as con:
+        with self.transaction() as con:
             cur = con.cursor()
             cur.execute(f"CREATE TABLE IF NOT EXISTS {self.table} ({schema})")
             # Index to speed up history queries
@@ -295,7 +981,7 @@ class LocationDB(_DB):
             )
             cur.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS uniq_{self.owner}_loc_user ON {self.table} (node_num)")
             cur.execute(f"PRAGMA table_info({self.table})")
-            lcols = {r[1] for r in cur.fetchall()}
+            lcols = {r[1] for r in cur}
             for name, typ in [
                 ("latitude_i", "INTEGER"),
                 ("longitude_i", "INTEGER"),
@@ -322,7 +1008,7 @@ class LocationDB(_DB):
             ]:
                 if name not in lcols:
                     cur.execute(f"ALTER TABLE {self.table} ADD COLUMN {name} {typ}")
-            con.commit()
+        self._mark_ensured(self.table)
 
     def save_packet(self, packet: Dict[str, object]) -> int:
         """Save a location packet. Expects a Meshtastic-like decoded dict.
@@ -330,103 +1016,74 @@ class LocationDB(_DB):
         Returns the stored timestamp.
         """
         self.ensure_table()
+        timestamp, params = self._packet_params(packet)
+        # Inside a write batch the row is queued, as TelemetryDB.save_packet does.
+        queued = getattr(_BATCH, "rows", None)
+        with self.transaction() as con:
+            sql = _upsert_sql(self.table, _LOCATION_COLUMNS)
+            if queued is None:
+                con.execute(sql, params)
+            else:
+                queued.setdefault((con, sql), {})[params[0]] = params
+        return timestamp
+
+    def save_packets(self, packets: Iterable[Dict[str, object]], flush_every_n: Optional[int] = None) -> List[int]:
+        """Save many location packets with one executemany.
+
+        Everything is written in one transaction, or one per `flush_every_n`
+        packets when given. Returns each packet's stored timestamp, in order.
+        """
+        self.ensure_table()
+        now = int(time.time())  # one fallback timestamp for the whole batch
+        stamps: List[int] = []
+        for chunk in _chunked(packets, flush_every_n):
+            rows = []
+            for packet in chunk:
+                timestamp, params = self._packet_params(packet, now)
+                stamps.append(timestamp)
+                rows.append(params)
+            with self.transaction() as con:
+                con.executemany(_upsert_sql(self.table, _LOCATION_COLUMNS), rows)
+        return stamps
+
+    @staticmethod
+    def _packet_params(packet: Dict[str, object], now: Optional[int] = None) -> Tuple[int, tuple]:
+        """Return (timestamp, upsert params in _LOCATION_COLUMNS order) for a location packet.
+
+        Packets without rxTime are stamped with `now` (the current time when omitted).
+        """
         node_num = packet.get("from")
         decoded = packet.get("decoded", {})
         pos = decoded.get("position", {})
-        timestamp = int(packet.get("rxTime", int(time.time())))
-
-        # Unified getters to accept both camelCase and snake_case from various decoders
-        def g(obj, *names, default=None):
-            for n in names:
-                if n in obj and obj.get(n) is not None:
-                    return obj.get(n)
-            return default
-
-        lat = g(pos, "latitude", "lat")
-        lon = g(pos, "longitude", "lon")
-        lat_i = g(pos, "latitudeI", "latitude_i")
-        lon_i = g(pos, "longitudeI", "longitude_i")
-        alt = g(pos, "altitude", "alt")
-        loc_src = g(pos, "locationSource", "location_source")
-        alt_src = g(pos, "altitudeSource", "altitude_source")
-        pos_time = g(pos, "time", "pos_time")
-        pos_ts = g(pos, "timestamp", "pos_timestamp")
-        pos_ts_adj = g(pos, "timestampMillisAdjust", "timestamp_millis_adjust", "pos_timestamp_ms_adjust")
-        alt_hae = g(pos, "altitudeHae", "altitude_hae")
-        alt_geo_sep = g(pos, "altitudeGeoidalSeparation", "altitude_geoidal_separation")
-        pdop = g(pos, "PDOP", "pdop")
-        hdop = g(pos, "HDOP", "hdop")
-        vdop = g(pos, "VDOP", "vdop")
-        gps_acc = g(pos, "gpsAccuracy", "gps_accuracy")
-        gspd = g(pos, "groundSpeed", "ground_speed")
-        gtrk = g(pos, "groundTrack", "ground_track")
-        fix_q = g(pos, "fixQuality", "fix_quality")
-        fix_t = g(pos, "fixType", "fix_type")
-        sats = g(pos, "satsInView", "sats_in_view")
-        sensor_id = g(pos, "sensorId", "sensor_id")
-        next_upd = g(pos, "nextUpdate", "next_update")
-        seq_no = g(pos, "seqNumber", "seq_number")
-        prec_bits = g(pos, "precisionBits", "precision_bits")
-        with self.connect() as con:
-            cur = con.cursor()
-            cur.execute(
-                f"INSERT INTO {self.table} ("
-                "node_num, timestamp, latitude, longitude, latitude_i, longitude_i, altitude, location_source, altitude_source, "
-                "pos_time, pos_timestamp, pos_timestamp_ms_adjust, altitude_hae, altitude_geoidal_separation, pdop, hdop, vdop, gps_accuracy, "
-                "ground_speed, ground_track, fix_quality, fix_type, sats_in_view, sensor_id, next_update, seq_number, precision_bits, precision"
-                ") VALUES (?,?,?,?,?,?,?,?,?, ?,?,?,?,?,?,?,?,?, ?,?,?,?,?,?,?,?,?, ?) "
-                "ON CONFLICT(node_num) DO UPDATE SET "
-                "timestamp=excluded.timestamp, latitude=excluded.latitude, longitude=excluded.longitude, "
-                "latitude_i=excluded.latitude_i, longitude_i=excluded.longitude_i, altitude=excluded.altitude, "
-                "location_source=excluded.location_source, altitude_source=excluded.altitude_source, "
-                "pos_time=excluded.pos_time, pos_timestamp=excluded.pos_timestamp, pos_timestamp_ms_adjust=excluded.pos_timestamp_ms_adjust, "
-                "altitude_hae=excluded.altitude_hae, altitude_geoidal_separation=excluded.altitude_geoidal_separation, "
-                "pdop=excluded.pdop, hdop=excluded.hdop, vdop=excluded.vdop, gps_accuracy=excluded.gps_accuracy, "
-                "ground_speed=excluded.ground_speed, ground_track=excluded.ground_track, fix_quality=excluded.fix_quality, "
-                "fix_type=excluded.fix_type, sats_in_view=excluded.sats_in_view, sensor_id=excluded.sensor_id, next_update=excluded.next_update, "
-                "seq_number=excluded.seq_number, precision_bits=excluded.precision_bits, precision=excluded.precision",
-                (
-                    node_num,
-                    timestamp,
-                    lat,
-                    lon,
-                    lat_i,
-                    lon_i,
-                    alt,
-                    loc_src,
-                    alt_src,
-                    pos_time,
-                    pos_ts,
-                    pos_ts_adj,
-                    alt_hae,
-                    alt_geo_sep,
-                    pdop,
-                    hdop,
-                    vdop,
-                    gps_acc,
-                    gspd,
-                    gtrk,
-                    fix_q,
-                    fix_t,
-                    sats,
-                    sensor_id,
-                    next_upd,
-                    seq_no,
-                    prec_bits,
-                    prec_bits,
-                ),
-            )
-            con.commit()
-        return timestamp
+        timestamp = int(packet["rxTime"]) if "rxTime" in packet else now or int(time.time())
+
+        # First non-None spelling per column, in _LOCATION_COLUMNS order
+        values = []
+        for names in _POSITION_FIELDS:
+            for name in names:
+                value = pos.get(name)
+                if value is not None:
+                    break
+            values.append(value)
+        # precision_bits is also written to the legacy precision column
+        return timestamp, (node_num, timestamp, *values, values[-1])
+
+    _LATEST_SQL = (
+        "SELECT timestamp, latitude, longitude FROM {table} WHERE node_num = ? ORDER BY timestamp DESC LIMIT 1"
+    )
+    _HISTORY_SQL = (
+        "SELECT timestamp, latitude, longitude FROM {table} WHERE node_num = ? ORDER BY timestamp ASC LIMIT ?"
+    )
+    _HISTORY_SINCE_SQL = (
+        "SELECT timestamp, latitude, longitude FROM {table} "
+        "WHERE node_num = ? AND timestamp >= ? ORDER BY timestamp ASC LIMIT ?"
+    )
 
     def latest_for_user(self, node_num: Union[int, str]) -> Optional[Tuple[int, float, float]]:
         self.ensure_table()
-        with self.connect() as con:
+        with self.borrow(read_only=True) as con:
             cur = con.cursor()
-            cur.execute(
-                f"SELECT timestamp, latitude, longitude FROM {self.table} WHERE node_num = ? ORDER BY timestamp DESC LIMIT 1",
-                (node_num,),
-            )
+            cur.execute(_format_sql(self._LATEST_SQL, self.table), (node_num,))
             row = cur.fetchone()
             return (row[0], row[1], row[2]) if row else None
 
@@ -434,19 +1091,19 @@ class LocationDB(_DB):
         self, node_num: Union[int, str], since_ts: Optional[int] = None, limit: int = 1000
     ) -> List[Tuple[int, float, float]]:
         self.ensure_table()
-        with self.connect() as con:
+        with self.borrow(read_only=True) as con:
             cur = con.cursor()
             if since_ts:
-                cur.execute(
-                    f"SELECT timestamp, latitude, longitude FROM {self.table} WHERE node_num = ? AND timestamp >= ? ORDER BY timestamp ASC LIMIT ?",
-                    (node_num, since_ts, limit),
-                )
+                cur.execute(_format_sql(self._HISTORY_SINCE_SQL, self.table), (node_num, since_ts, limit))
             else:
-                cur.execute(
-                    f"SELECT timestamp, latitude, longitude FROM {self.table} WHERE node_num = ? ORDER BY timestamp ASC LIMIT ?",
-                    (node_num, limit),
-                )
-            return [(r[0], r[1], r[2]) for r in cur.fetchall()]
+                cur.execute(_format_sql(self._HISTORY_SQL, self.table), (node_num, limit))
+            return [(r[0], r[1], r[2]) for r in cur]
+
+    def latest_for_nodes(self, node_nums: Iterable[Union[int, str]]) -> Dict[int, Dict[str, object]]:
+        """Return {node_num: latest location row as a dict} for many nodes in one query."""
+        self.ensure_table()
+        with self.borrow(read_only=True) as con:
+            return _rows_by_node(con.cursor(), self.table, list(node_nums))
 
 
 class TelemetryDB(_DB):
@@ -462,36 +1119,37 @@ class TelemetryDB(_DB):
       - <owner>_telemetry_host(node_num, timestamp, uptime_seconds, freemem_bytes, diskfree1_bytes, diskfree2_bytes, diskfree3_bytes, load1, load5, load15, user_string)
     """
 
-    @property
-    def table_device(self) -> str:
-        return f'"{self.owner}_telemetry_device"'
-
-    @property
-    def table_power(self) -> str:
-        return f'"{self.owner}_telemetry_power"'
-
-    @property
-    def table_environment(self) -> str:
-        return f'"{self.owner}_telemetry_environment"'
-
-    @property
-    def table_air_quality(self) -> str:
-        return f'"{self.owner}_telemetry_air_quality"'
-
-    @property
-    def table_local_stats(self) -> str:
-        return f'"{self.owner}_telemetry_local_stats"'
-
-    @property
-    def table_health(self) -> str:
-        return f'"{self.owner}_telemetry_health"'
-
-    @property
-    def table_host(self) -> str:
-        return f'"{self.owner}_telemetry_host"'
+    def __init__(self, node_database_number: Union[int, str], db_path: Optional[str] = None):
+        super().__init__(node_database_number, db_path)
+        # Quoted table names, built once; `tables` maps each metrics subtype (as in
+        # _TELEMETRY_COLUMNS) to its table.
+        self.table_device = f'"{self.owner}_telemetry_device"'
+        self.table_power = f'"{self.owner}_telemetry_power"'
+        self.table_environment = f'"{self.owner}_telemetry_environment"'
+        self.table_air_quality = f'"{self.owner}_telemetry_air_quality"'
+        self.table_local_stats = f'"{self.owner}_telemetry_local_stats"'
+        self.table_health = f'"{self.owner}_telemetry_health"'
+        self.table_host = f'"{self.owner}_telemetry_host"'
+        self.tables: Dict[str, str] = {
+            "device": self.table_device,
+            "power": self.table_power,
+            "environment": self.table_environment,
+            "air_quality": self.table_air_quality,
+            "local_stats": self.table_local_stats,
+            "health": self.table_health,
+            "host": self.table_host,
+        }
+        # Upsert per metrics variant, built once per instance and keyed by subtype.
+        self.sql_upsert: Dict[str, str] = {
+            subtype: _upsert_sql(table, _TELEMETRY_COLUMNS[subtype]) for subtype, table in self.tables.items()
+        }
 
     def ensure_tables(self) -> None:
-        with self.connect() as con:
+        columns = self._ensured("telemetry")
+        if columns:
+            self.columns = columns
+            return
+        with self.transaction() as con:
             cur = con.cursor()
             cur.execute(
                 f"CREATE TABLE IF NOT EXISTS {self.table_device} ("
@@ -682,7 +1340,20 @@ class TelemetryDB(_DB):
             cur.execute(
                 f"CREATE UNIQUE INDEX IF NOT EXISTS uniq_{self.owner}_thost_user ON {self.table_host} (node_num)"
             )
-            con.commit()
+            # Column names per table, read once so readers can project rows without cursor.description
+            self.columns: Dict[str, Tuple[str, ...]] = {}
+            for table in (
+                self.table_device,
+                self.table_power,
+                self.table_environment,
+                self.table_air_quality,
+                self.table_local_stats,
+                self.table_health,
+                self.table_host,
+            ):
+                cur.execute(f"PRAGMA table_info({table})")
+                self.columns[table] = tuple(r[1] for r in cur)
+        self._mark_ensured("telemetry", self.columns)
 
     def save_packet(self, packet: Dict[str, object]) -> int:
         """Persist any telemetry metrics present in a decoded packet.
@@ -690,230 +1361,92 @@ class TelemetryDB(_DB):
         Returns the stored timestamp.
         """
         self.ensure_tables()
-        node_num = packet.get("from")
-        decoded = packet.get("decoded", {})
-        telem = decoded.get("telemetry", {})
-        ts = int(telem.get("time") or packet.get("rxTime") or time.time())
+        ts, rows = self._packet_rows(packet)
+        if not rows:
+            return ts
+        # Inside a write batch (e.g. the background writer) rows are queued and
+        # written per table with executemany when the batch commits.
+        queued = getattr(_BATCH, "rows", None)
+        with self.transaction() as con:
+            for subtype, params in rows.items():
+                sql = self.sql_upsert[subtype]
+                if queued is None:
+                    con.execute(sql, params)
+                else:
+                    # Every column is overwritten on conflict, so the latest row per node wins.
+                    queued.setdefault((con, sql), {})[params[0]] = params
+        return ts
 
-        device = telem.get("deviceMetrics")
-        power = telem.get("powerMetrics")
-        env = telem.get("environmentMetrics") or telem.get("environment_metrics")
-        aq = telem.get("airQualityMetrics") or telem.get("air_quality_metrics")
-        ls = telem.get("localStats") or telem.get("local_stats")
-        health = telem.get("healthMetrics") or telem.get("health_metrics")
-        host = telem.get("hostMetrics") or telem.get("host_metrics")
+    def save_packets(self, packets: Iterable[Dict[str, object]], flush_every_n: Optional[int] = None) -> List[int]:
+        """Persist telemetry from many packets with one executemany per metrics table.
 
-        with self.connect() as con:
+        Everything is written in one transaction, or one per `flush_every_n`
+        packets when given. Returns each packet's stored timestamp, in order.
+        """
+        self.ensure_tables()
+        now = int(time.time())  # one fallback timestamp for the whole batch
+        stamps: List[int] = []
+        for chunk in _chunked(packets, flush_every_n):
+            by_subtype: Dict[str, List[tuple]] = {}
+            for packet in chunk:
+                ts, rows = self._packet_rows(packet, now)
+                stamps.append(ts)
+                for subtype, params in rows.items():
+                    by_subtype.setdefault(subtype, []).append(params)
+            if not by_subtype:
+                continue
+            with self.transaction() as con:
+                for subtype, params in by_subtype.items():
+                    con.executemany(self.sql_upsert[subtype], params)
+        return stamps
+
+    def latest_for_nodes(self, node_nums: Iterable[Union[int, str]]) -> Dict[str, Dict[int, Dict[str, object]]]:
+        """Return {subtype: {node_num: latest row as a dict}} for many nodes, one query per metrics table."""
+        self.ensure_tables()
+        nums = list(node_nums)
+        with self.borrow(read_only=True) as con:
             cur = con.cursor()
+            return {subtype: _rows_by_node(cur, table, nums) for subtype, table in self.tables.items()}
 
-            if isinstance(device, dict):
-                cur.execute(
-                    f"INSERT INTO {self.table_device} (node_num, timestamp, battery_level, voltage, channel_utilization, air_util_tx, uptime_seconds) "
-                    "VALUES (?, ?, ?, ?, ?, ?, ?) "
-                    "ON CONFLICT(node_num) DO UPDATE SET "
-                    "timestamp=excluded.timestamp, battery_level=excluded.battery_level, voltage=excluded.voltage, "
-                    "channel_utilization=excluded.channel_utilization, air_util_tx=excluded.air_util_tx, uptime_seconds=excluded.uptime_seconds",
-                    (
-                        node_num,
-                        ts,
-                        device.get("batteryLevel"),
-                        device.get("voltage"),
-                        device.get("channelUtilization"),
-                        device.get("airUtilTx"),
-                        device.get("uptimeSeconds"),
-                    ),
-                )
+    def _packet_rows(self, packet: Dict[str, object], now: Optional[int] = None) -> Tuple[int, Dict[str, tuple]]:
+        """Return (timestamp, {subtype: upsert params}) for the metrics present in a packet.
 
-            if isinstance(power, dict):
-                cur.execute(
-                    f"INSERT INTO {self.table_power} (node_num, timestamp, ch1_voltage, ch1_current, ch2_voltage, ch2_current, ch3_voltage, ch3_current, ch4_voltage, ch4_current, ch5_voltage, ch5_current, ch6_voltage, ch6_current, ch7_voltage, ch7_current, ch8_voltage, ch8_current) "
-                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
-                    "ON CONFLICT(node_num) DO UPDATE SET "
-                    "timestamp=excluded.timestamp, ch1_voltage=excluded.ch1_voltage, ch1_current=excluded.ch1_current, "
-                    "ch2_voltage=excluded.ch2_voltage, ch2_current=excluded.ch2_current, ch3_voltage=excluded.ch3_voltage, ch3_current=excluded.ch3_current, "
-                    "ch4_voltage=excluded.ch4_voltage, ch4_current=excluded.ch4_current, ch5_voltage=excluded.ch5_voltage, ch5_current=excluded.ch5_current, "
-                    "ch6_voltage=excluded.ch6_voltage, ch6_current=excluded.ch6_current, ch7_voltage=excluded.ch7_voltage, ch7_current=excluded.ch7_current, "
-                    "ch8_voltage=excluded.ch8_voltage, ch8_current=excluded.ch8_current",
-                    (
-                        node_num,
-                        ts,
-                        power.get("ch1Voltage"),
-                        power.get("ch1Current"),
-                        power.get("ch2Voltage"),
-                        power.get("ch2Current"),
-                        power.get("ch3Voltage"),
-                        power.get("ch3Current"),
-                        power.get("ch4Voltage"),
-                        power.get("ch4Current"),
-                        power.get("ch5Voltage"),
-                        power.get("ch5Current"),
-                        power.get("ch6Voltage"),
-                        power.get("ch6Current"),
-                        power.get("ch7Voltage"),
-                        power.get("ch7Current"),
-                        power.get("ch8Voltage"),
-                        power.get("ch8Current"),
-                    ),
-                )
-
-            if isinstance(env, dict):
-                cur.execute(
-                    f"INSERT INTO {self.table_environment} (node_num, timestamp, temperature, relative_humidity, barometric_pressure, gas_resistance, voltage, current, iaq, distance, lux, white_lux, ir_lux, uv_lux, wind_direction, wind_speed, weight, wind_gust, wind_lull, radiation, rainfall_1h, rainfall_24h, soil_moisture, soil_temperature) "
-                    "VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?) "
-                    "ON CONFLICT(node_num) DO UPDATE SET "
-                    "timestamp=excluded.timestamp, temperature=excluded.temperature, relative_humidity=excluded.relative_humidity, "
-                    "barometric_pressure=excluded.barometric_pressure, gas_resistance=excluded.gas_resistance, voltage=excluded.voltage, current=excluded.current, "
-                    "iaq=excluded.iaq, distance=excluded.distance, lux=excluded.lux, white_lux=excluded.white_lux, ir_lux=excluded.ir_lux, uv_lux=excluded.uv_lux, "
-                    "wind_direction=excluded.wind_direction, wind_speed=excluded.wind_speed, weight=excluded.weight, wind_gust=excluded.wind_gust, wind_lull=excluded.wind_lull, "
-                    "radiation=excluded.radiation, rainfall_1h=excluded.rainfall_1h, rainfall_24h=excluded.rainfall_24h, soil_moisture=excluded.soil_moisture, soil_temperature=excluded.soil_temperature",
-                    (
-                        node_num,
-                        ts,
-                        env.get("temperature"),
-                        env.get("relativeHumidity") if "relativeHumidity" in env else env.get("relative_humidity"),
-                        (
-                            env.get("barometricPressure")
-                            if "barometricPressure" in env
-                            else env.get("barometric_pressure")
-                        ),
-                        env.get("gasResistance") if "gasResistance" in env else env.get("gas_resistance"),
-                        env.get("voltage"),
-                        env.get("current"),
-                        env.get("iaq"),
-                        env.get("distance"),
-                        env.get("lux"),
-                        env.get("whiteLux") if "whiteLux" in env else env.get("white_lux"),
-                        env.get("irLux") if "irLux" in env else env.get("ir_lux"),
-                        env.get("uvLux") if "uvLux" in env else env.get("uv_lux"),
-                        env.get("windDirection") if "windDirection" in env else env.get("wind_direction"),
-                        env.get("windSpeed") if "windSpeed" in env else env.get("wind_speed"),
-                        env.get("weight"),
-                        env.get("windGust") if "windGust" in env else env.get("wind_gust"),
-                        env.get("windLull") if "windLull" in env else env.get("wind_lull"),
-                        env.get("radiation"),
-                        env.get("rainfall1h") if "rainfall1h" in env else env.get("rainfall_1h"),
-                        env.get("rainfall24h") if "rainfall24h" in env else env.get("rainfall_24h"),
-                        env.get("soilMoisture") if "soilMoisture" in env else env.get("soil_moisture"),
-                        env.get("soilTemperature") if "soilTemperature" in env else env.get("soil_temperature"),
-                    ),
-                )
-
-            if isinstance(aq, dict):
-                cur.execute(
-                    f"INSERT INTO {self.table_air_quality} (node_num, timestamp, pm10_standard, pm25_standard, pm100_standard, pm10_environmental, pm25_environmental, pm100_environmental, particles_03um, particles_05um, particles_10um, particles_25um, particles_50um, particles_100um, co2, co2_temperature, co2_humidity, form_formaldehyde, form_humidity, form_temperature, pm40_standard, particles_40um, pm_temperature, pm_humidity, pm_voc_idx, pm_nox_idx, particles_tps) "
-                    "VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?) "
-                    "ON CONFLICT(node_num) DO UPDATE SET "
-                    "timestamp=excluded.timestamp, pm10_standard=excluded.pm10_standard, pm25_standard=excluded.pm25_standard, pm100_standard=excluded.pm100_standard, "
-                    "pm10_environmental=excluded.pm10_environmental, pm25_environmental=excluded.pm25_environmental, pm100_environmental=excluded.pm100_environmental, "
-                    "particles_03um=excluded.particles_03um, particles_05um=excluded.particles_05um, particles_10um=excluded.particles_10um, particles_25um=excluded.particles_25um, "
-                    "particles_50um=excluded.particles_50um, particles_100um=excluded.particles_100um, co2=excluded.co2, co2_temperature=excluded.co2_temperature, co2_humidity=excluded.co2_humidity, "
-                    "form_formaldehyde=excluded.form_formaldehyde, form_humidity=excluded.form_humidity, form_temperature=excluded.form_temperature, pm40_standard=excluded.pm40_standard, "
-                    "particles_40um=excluded.particles_40um, pm_temperature=excluded.pm_temperature, pm_humidity=excluded.pm_humidity, pm_voc_idx=excluded.pm_voc_idx, pm_nox_idx=excluded.pm_nox_idx, particles_tps=excluded.particles_tps",
-                    (
-                        node_num,
-                        ts,
-                        aq.get("pm10Standard") if "pm10Standard" in aq else aq.get("pm10_standard"),
-                        aq.get("pm25Standard") if "pm25Standard" in aq else aq.get("pm25_standard"),
-                        aq.get("pm100Standard") if "pm100Standard" in aq else aq.get("pm100_standard"),
-                        aq.get("pm10Environmental") if "pm10Environmental" in aq else aq.get("pm10_environmental"),
-                        aq.get("pm25Environmental") if "pm25Environmental" in aq else aq.get("pm25_environmental"),
-                        aq.get("pm100Environmental") if "pm100Environmental" in aq else aq.get("pm100_environmental"),
-                        aq.get("particles03um") if "particles03um" in aq else aq.get("particles_03um"),
-                        aq.get("particles05um") if "particles05um" in aq else aq.get("particles_05um"),
-                        aq.get("particles10um") if "particles10um" in aq else aq.get("particles_10um"),
-                        aq.get("particles25um") if "particles25um" in aq else aq.get("particles_25um"),
-                        aq.get("particles50um") if "particles50um" in aq else aq.get("particles_50um"),
-                        aq.get("particles100um") if "particles100um" in aq else aq.get("particles_100um"),
-                        aq.get("co2"),
-                        aq.get("co2Temperature") if "co2Temperature" in aq else aq.get("co2_temperature"),
-                        aq.get("co2Humidity") if "co2Humidity" in aq else aq.get("co2_humidity"),
-                        aq.get("formFormaldehyde") if "formFormaldehyde" in aq else aq.get("form_formaldehyde"),
-                        aq.get("formHumidity") if "formHumidity" in aq else aq.get("form_humidity"),
-                        aq.get("formTemperature") if "formTemperature" in aq else aq.get("form_temperature"),
-                        aq.get("pm40Standard") if "pm40Standard" in aq else aq.get("pm40_standard"),
-                        aq.get("particles40um") if "particles40um" in aq else aq.get("particles_40um"),
-                        aq.get("pmTemperature") if "pmTemperature" in aq else aq.get("pm_temperature"),
-                        aq.get("pmHumidity") if "pmHumidity" in aq else aq.get("pm_humidity"),
-                        aq.get("pmVocIdx") if "pmVocIdx" in aq else aq.get("pm_voc_idx"),
-                        aq.get("pmNoxIdx") if "pmNoxIdx" in aq else aq.get("pm_nox_idx"),
-                        aq.get("particlesTps") if "particlesTps" in aq else aq.get("particles_tps"),
-                    ),
-                )
-
-            if isinstance(ls, dict):
-                cur.execute(
-                    f"INSERT INTO {self.table_local_stats} (node_num, timestamp, uptime_seconds, channel_utilization, air_util_tx, num_packets_tx, num_packets_rx, num_packets_rx_bad, num_online_nodes, num_total_nodes, num_rx_dupe, num_tx_relay, num_tx_relay_canceled, heap_total_bytes, heap_free_bytes, num_tx_dropped) "
-                    "VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?) "
-                    "ON CONFLICT(node_num) DO UPDATE SET "
-                    "timestamp=excluded.timestamp, uptime_seconds=excluded.uptime_seconds, channel_utilization=excluded.channel_utilization, "
-                    "air_util_tx=excluded.air_util_tx, num_packets_tx=excluded.num_packets_tx, num_packets_rx=excluded.num_packets_rx, "
-                    "num_packets_rx_bad=excluded.num_packets_rx_bad, num_online_nodes=excluded.num_online_nodes, num_total_nodes=excluded.num_total_nodes, "
-                    "num_rx_dupe=excluded.num_rx_dupe, num_tx_relay=excluded.num_tx_relay, num_tx_relay_canceled=excluded.num_tx_relay_canceled, "
-                    "heap_total_bytes=excluded.heap_total_bytes, heap_free_bytes=excluded.heap_free_bytes, num_tx_dropped=excluded.num_tx_dropped",
-                    (
-                        node_num,
-                        ts,
-                        ls.get("uptimeSeconds") if "uptimeSeconds" in ls else ls.get("uptime_seconds"),
-                        ls.get("channelUtilization") if "channelUtilization" in ls else ls.get("channel_utilization"),
-                        ls.get("airUtilTx") if "airUtilTx" in ls else ls.get("air_util_tx"),
-                        ls.get("numPacketsTx") if "numPacketsTx" in ls else ls.get("num_packets_tx"),
-                        ls.get("numPacketsRx") if "numPacketsRx" in ls else ls.get("num_packets_rx"),
-                        ls.get("numPacketsRxBad") if "numPacketsRxBad" in ls else ls.get("num_packets_rx_bad"),
-                        ls.get("numOnlineNodes") if "numOnlineNodes" in ls else ls.get("num_online_nodes"),
-                        ls.get("numTotalNodes") if "numTotalNodes" in ls else ls.get("num_total_nodes"),
-                        ls.get("numRxDupe") if "numRxDupe" in ls else ls.get("num_rx_dupe"),
-                        ls.get("numTxRelay") if "numTxRelay" in ls else ls.get("num_tx_relay"),
-                        (
-                            ls.get("numTxRelayCanceled")
-                            if "numTxRelayCanceled" in ls
-                            else ls.get("num_tx_relay_canceled")
-                        ),
-                        ls.get("heapTotalBytes") if "heapTotalBytes" in ls else ls.get("heap_total_bytes"),
-                        ls.get("heapFreeBytes") if "heapFreeBytes" in ls else ls.get("heap_free_bytes"),
-                        ls.get("numTxDropped") if "numTxDropped" in ls else ls.get("num_tx_dropped"),
-                    ),
-                )
-
-            if isinstance(health, dict):
-                cur.execute(
-                    f"INSERT INTO {self.table_health} (node_num, timestamp, heart_bpm, spO2, temperature) "
-                    "VALUES (?,?,?,?,?) "
-                    "ON CONFLICT(node_num) DO UPDATE SET "
-                    "timestamp=excluded.timestamp, heart_bpm=excluded.heart_bpm, spO2=excluded.spO2, temperature=excluded.temperature",
-                    (
-                        node_num,
-                        ts,
-                        health.get("heartBpm") if "heartBpm" in health else health.get("heart_bpm"),
-                        health.get("spO2") if "spO2" in health else health.get("spO2"),
-                        health.get("temperature"),
-                    ),
-                )
+        Packets without a time or rxTime are stamped with `now` (the current time when omitted).
+        """
+        node_num = packet.get("from")
+        decoded = packet.get("decoded", {})
+        telem = decoded.get("telemetry", {})
+        ts = int(telem.get("time") or packet.get("rxTime") or now or time.time())
+
+        rows: Dict[str, tuple] = {}
+        # Walk the payload's own keys (usually "time" plus one variant) rather than
+        # probing every spelling of every variant.
+        seen = set()
+        for name in telem:
+            subtype = _TELEMETRY_KEY_SUBTYPES.get(name)
+            if subtype is None or subtype in seen:
+                continue
+            seen.add(subtype)
+            for key in _TELEMETRY_KEYS[subtype]:
+                metrics = telem.get(key)
+                if metrics:
+                    break
+            if not isinstance(metrics, dict):
+                continue
+            get, defaults, snake_only = _TELEMETRY_GETTERS[subtype]
+            if snake_only.isdisjoint(metrics):
+                values = get({**defaults, **metrics})
+            else:
+                # camelCase wins when present, else the snake_case spelling
+                values = [metrics.get(c, metrics.get(s)) for c, s in _TELEMETRY_FIELDS[subtype]]
+            # A variant with no values would only blank out the stored latest row.
+            if values.count(None) < len(values):
+                rows[subtype] = (node_num, ts, *values)
+        return ts, rows
 
-            if isinstance(host, dict):
-                cur.execute(
-                    f"INSERT INTO {self.table_host} (node_num, timestamp, uptime_seconds, freemem_bytes, diskfree1_bytes, diskfree2_bytes, diskfree3_bytes, load1, load5, load15, user_string) "
-                    "VALUES (?,?,?,?,?,?,?,?,?,?,?) "
-                    "ON CONFLICT(node_num) DO UPDATE SET "
-                    "timestamp=excluded.timestamp, uptime_seconds=excluded.uptime_seconds, freemem_bytes=excluded.freemem_bytes, "
-                    "diskfree1_bytes=excluded.diskfree1_bytes, diskfree2_bytes=excluded.diskfree2_bytes, diskfree3_bytes=excluded.diskfree3_bytes, "
-                    "load1=excluded.load1, load5=excluded.load5, load15=excluded.load15, user_string=excluded.user_string",
-                    (
-                        node_num,
-                        ts,
-                        host.get("uptimeSeconds") if "uptimeSeconds" in host else host.get("uptime_seconds"),
-                        host.get("freememBytes") if "freememBytes" in host else host.get("freemem_bytes"),
-                        host.get("diskfree1Bytes") if "diskfree1Bytes" in host else host.get("diskfree1_bytes"),
-                        host.get("diskfree2Bytes") if "diskfree2Bytes" in host else host.get("diskfree2_bytes"),
-                        host.get("diskfree3Bytes") if "diskfree3Bytes" in host else host.get("diskfree3_bytes"),
-                        host.get("load1"),
-                        host.get("load5"),
-                        host.get("load15"),
-                        host.get("userString") if "userString" in host else host.get("user_string"),
-                    ),
-                )
 
-            con.commit()
-        return ts
+# SQLite's default cap on the terms of one compound SELECT (SQLITE_MAX_COMPOUND_SELECT).
+_MAX_COMPOUND_SELECT = 500
 
 
 class MessageDB(_DB):
@@ -924,83 +1457,90 @@ class MessageDB(_DB):
         return f'"{table_name}"'
 
     def ensure_channel_table(self, channel: Union[int, str]) -> None:
+        table = self._table_for_channel(channel)
+        if self._ensured(table):
+            return
         schema = "node_num TEXT," "message_text TEXT," "timestamp INTEGER"
-        with self.connect() as con:
+        with self.transaction() as con:
             cur = con.cursor()
-            cur.execute(f"CREATE TABLE IF NOT EXISTS {self._table_for_channel(channel)} ({schema})")
-            con.commit()
-
-    def save_message(self, channel: Union[int, str], node_num: Union[int, str], message_text: str) -> int:
-        self.ensure_channel_table(channel)
-        ts = int(time.time())
-        with self.connect() as con:
+            cur.execute(f"CREATE TABLE IF NOT EXISTS {table} ({schema})")
+            # Lets load_messages(since=...) read only the tail of the table
+            cur.execute(f'CREATE INDEX IF NOT EXISTS "idx_{self.owner}_{channel}_messages_ts" ON {table} (timestamp)')
+        self._mark_ensured(table)
+
+    def save_message(
+        self, channel: Union[int, str], node_num: Union[int, str], message_text: str, ts: Optional[int] = None
+    ) -> int:
+        """Store a message and return its timestamp: `ts` (e.g. the packet's rxTime), or now when not given."""
+        ts = int(ts) if ts else int(time.time())
+        with self.transaction() as con:
+            # Joins this transaction, so a new channel's CREATE TABLE commits with its first message.
+            self.ensure_channel_table(channel)
             cur = con.cursor()
             cur.execute(
                 f"INSERT INTO {self._table_for_channel(channel)} (node_num, message_text, timestamp) VALUES (?, ?, ?)",
                 (str(node_num), message_text, ts),
             )
-            con.commit()
         return ts
 
     def update_ack_nak(
         self, channel: Union[int, str], timestamp: int, node_num: Union[int, str], message: str, ack: str
     ) -> None:
-        # Deprecated: ack_type column has been removed; keep as no-op for backward compatibility.
-        logging.debug("update_ack_nak called but ack_type support is removed; ignoring.")
-        return
+        """Deprecated no-op, kept for backward compatibility; the ack_type column has been removed."""
 
-    def load_messages(self) -> Dict[Union[int, str], List[Tuple[str, str]]]:
+    def load_messages(self, since: Optional[int] = None) -> Dict[Union[int, str], List[Tuple[str, str]]]:
         """Return all messages grouped by channel as a dict[channel] -> list[(prefix, text)].
         The hour separators are included as entries with empty text.
+        With `since` (unix seconds), only messages from that time on are loaded.
         Ack/Nak is no longer stored; this function ignores an existing ack_type column if present.
         """
         out: Dict[Union[int, str], List[Tuple[str, str]]] = {}
-        with self.connect() as con:
+        if not os.path.exists(self.db_path):
+            return out  # nothing stored yet, and a read-only connection cannot create the file
+        with self.borrow(read_only=True) as con:
             cur = con.cursor()
             cur.execute(
                 "SELECT name FROM sqlite_master WHERE type='table' AND name LIKE ?",
                 (f"{self.owner}_%_messages",),
             )
-            tables = [r[0] for r in cur.fetchall()]
+            tables = [r[0] for r in cur]
 
+            # Infer channel names
+            channels: List[Union[int, str]] = []
             for table_name in tables:
-                quoted = f'"{table_name}"'
-
-                # Detect columns for this table
-                cur.execute(f"PRAGMA table_info({quoted})")
-                cols = {r[1] for r in cur.fetchall()}
-                has_ack = "ack_type" in cols
-
-                # Build a SELECT based on available columns
-                if has_ack:
-                    cur.execute(f"SELECT node_num, message_text, timestamp FROM {quoted}")
-                else:
-                    cur.execute(f"SELECT node_num, message_text, timestamp FROM {quoted}")
-                rows = cur.fetchall()
-
-                # Infer channel name
                 try:
                     channel = table_name.split("_")[1]
                     channel = int(channel) if channel.isdigit() else channel
                 except Exception:
                     channel = table_name
+                channels.append(channel)
+                out.setdefault(channel, [])
 
-                # Group hourly
-                hourly: Dict[str, List[Tuple[str, str]]] = {}
-                for uid, msg, ts in rows:
+            # All channel tables in one UNION ALL (per _MAX_COMPOUND_SELECT tables), sorted by
+            # channel, local hour and insertion order, with the hour formatted by SQLite.
+            where = " WHERE timestamp >= :since" if since is not None else ""
+            for chunk_start in range(0, len(tables), _MAX_COMPOUND_SELECT):
+                chunk = tables[chunk_start : chunk_start + _MAX_COMPOUND_SELECT]
+                cur.execute(
+                    " UNION ALL ".join(
+                        f"SELECT {i}, node_num, message_text, timestamp, "
+                        f"strftime('%Y-%m-%d %H:00', timestamp, 'unixepoch', 'localtime'), rowid FROM \"{name}\"{where}"
+                        for i, name in enumerate(chunk, chunk_start)
+                    )
+                    + " ORDER BY 1, 5, 6",
+                    {"since": since},
+                )
+                current = None
+                for i, uid, msg, ts, hour, _ in cur:
                     if uid is None or msg is None or ts is None:
                         logging.warning(f"Skipping row with NULL field(s): {(uid, msg, ts)}")
                         continue
-
-                    hour = datetime.fromtimestamp(int(ts)).strftime("%Y-%m-%d %H:00")
-                    hourly.setdefault(hour, [])
+                    msgs = out[channels[i]]
+                    if (i, hour) != current:
+                        current = (i, hour)
+                        msgs.append((f"-- {hour} --", ""))
                     # No ack prefix anymore
-                    hourly[hour].append(("", msg.replace("\x00", "")))
-
-                out.setdefault(channel, [])
-                for hour, msgs in sorted(hourly.items()):
-                    out[channel].append((f"-- {hour} --", ""))
-                    out[channel].extend(msgs)
+                    msgs.append(("", msg.replace("\x00", "")))
         return out
 
 
@@ -1009,6 +1549,22 @@ class MessageDB(_DB):
 # ------------------------------
 
 
+@functools.lru_cache(maxsize=256)
+def _cached_db(cls: type, node_database_number: Union[int, str], db_path: Optional[str]) -> _DB:
+    return cls(node_database_number, db_path)
+
+
+def _db(cls: type, node_database_number: Union[int, str], db_path: Optional[str] = None) -> _DB:
+    """Return a shared `cls` handler for the owner and path, built once instead of per packet.
+
+    Paths that depend on the current directory (relative, or no path and no
+    default) are resolved afresh each time, as _default_db_path does.
+    """
+    if (os.path.isabs(db_path) or db_path.startswith("~")) if db_path else DEFAULT_DB_BASE_PATH:
+        return _cached_db(cls, node_database_number, db_path)
+    return cls(node_database_number, db_path)
+
+
 def save_message_to_db(
     channel: str,
     node_num: str,
@@ -1018,7 +1574,7 @@ def save_message_to_db(
     db_path: Optional[str] = None,
 ) -> Optional[int]:
     try:
-        return MessageDB(node_database_number, db_path).save_message(channel, node_num, message_text)
+        return _db(MessageDB, node_database_number, db_path).save_message(channel, node_num, message_text)
     except sqlite3.Error as e:
         logging.error(f"SQLite error in save_message_to_db: {e}")
     except Exception as e:
@@ -1036,18 +1592,14 @@ def update_ack_nak(
     node_num: Union[int, str],
     db_path: Optional[str] = None,
 ) -> None:
-    try:
-        logging.debug("update_ack_nak wrapper called but ack_type support is removed; ignoring.")
-        return
-    except Exception:
-        return
+    """Deprecated no-op, kept for backward compatibility; the ack_type column has been removed."""
 
 
 def get_name_from_database(
     node_num: int, kind: str = "long", *, node_database_number: Union[int, str], db_path: Optional[str] = None
 ) -> str:
     try:
-        return NodeDB(node_database_number, db_path).get_name(node_num, kind)
+        return _db(NodeDB, node_database_number, db_path).get_name(node_num, kind)
     except sqlite3.Error as e:
         logging.error(f"SQLite error in get_name_from_database: {e}")
         return "Unknown"
@@ -1062,7 +1614,7 @@ def maybe_store_nodeinfo_in_db(
     try:
         node_num = packet["from"]
         user = packet["decoded"]["user"]
-        NodeDB(node_database_number, db_path).upsert(
+        _db(NodeDB, node_database_number, db_path).upsert(
             node_num=node_num,
             long_name=user.get("longName", ""),
             short_name=user.get("shortName", ""),
@@ -1083,7 +1635,7 @@ def store_location_packet(
     packet: Dict[str, object], *, node_database_number: Union[int, str], db_path: Optional[str] = None
 ) -> Optional[int]:
     try:
-        return LocationDB(node_database_number, db_path).save_packet(packet)
+        return _db(LocationDB, node_database_number, db_path).save_packet(packet)
     except sqlite3.Error as e:
         logging.error(f"SQLite error in store_location_packet: {e}")
     except Exception as e:
@@ -1096,7 +1648,7 @@ def store_telemetry_packet(
 ) -> Optional[int]:
     """Persist TELEMETRY_APP packets (deviceMetrics, powerMetrics, etc.)."""
     try:
-        return TelemetryDB(node_database_number, db_path).save_packet(packet)
+        return _db(TelemetryDB, node_database_number, db_path).save_packet(packet)
     except sqlite3.Error as e:
         logging.error(f"SQLite error in store_telemetry_packet: {e}")
     except Exception as e:
@@ -1139,7 +1691,7 @@ def store_text_message_packet(
             return None
 
         node_num = packet.get("from")
-        return MessageDB(node_database_number, db_path).save_message(channel, node_num, text)
+        return _db(MessageDB, node_database_number, db_path).save_message(channel, node_num, text, packet.get("rxTime"))
     except sqlite3.Error as e:
         logging.error(f"SQLite error in store_text_message_packet: {e}")
     except Exception as e:
@@ -1152,12 +1704,14 @@ def store_text_message_packet(
 # ------------------------------
 
 
-def get_connected_device_node_num(iface) -> Optional[int]:
+def get_connected_device_node_num(iface, *, background: bool = False) -> Optional[int]:
     """Return the connected device's own node number (if available) and
     **also** sync the device's NodeDB into the local SQL DB as a side effect.
 
     The sync uses the library's current default DB base path set via
     `set_default_db_path(...)`. If none is set, it falls back to the CWD.
+    With background=True the DB writes are handed to the background writer
+    so the caller does not block on disk (see flush_packets()).
     """
     try:
         info = iface.getMyNodeInfo()
@@ -1166,7 +1720,7 @@ def get_connected_device_node_num(iface) -> Optional[int]:
             if isinstance(num, int):
                 # Best-effort: pull the device NodeDB and merge locally
                 try:
-                    sync_nodes_from_interface(num, iface, db_path=None)
+                    sync_nodes_from_interface(num, iface, db_path=None, background=background)
                 except Exception as e:
                     logging.debug(f"sync_nodes_from_interface skipped: {e}")
                 return num
@@ -1180,6 +1734,11 @@ def get_connected_device_node_num(iface) -> Optional[int]:
 # ------------------------------
 
 
+def _node_dicts(items: Iterable) -> List[Dict[str, object]]:
+    """Snapshot `items` as a list of the node dicts among them, skipping anything else."""
+    return [n for n in items if isinstance(n, dict)]
+
+
 def _extract_nodes_from_interface(iface) -> List[Dict[str, object]]:
     """Best-effort extraction of device-style node snapshots from a Meshtastic interface.
 
@@ -1196,9 +1755,9 @@ def _extract_nodes_from_interface(iface) -> List[Dict[str, object]]:
         if callable(get_db):
             data = get_db()
             if isinstance(data, list):
-                nodes = [n for n in data if isinstance(n, dict)]
+                nodes = _node_dicts(data)
             elif isinstance(data, dict):
-                nodes = [n for n in data.values() if isinstance(n, dict)]
+                nodes = _node_dicts(data.values())
             if nodes:
                 return nodes
     except Exception:
@@ -1208,24 +1767,31 @@ def _extract_nodes_from_interface(iface) -> List[Dict[str, object]]:
     try:
         attr = getattr(iface, "nodes", None)
         if isinstance(attr, dict):
-            return [n for n in attr.values() if isinstance(n, dict)]
+            return _node_dicts(attr.values())
         if isinstance(attr, list):
-            return [n for n in attr if isinstance(n, dict)]
+            return _node_dicts(attr)
     except Exception:
         pass
 
     return nodes
 
 
-def sync_nodes_from_interface(node_database_number: Union[int, str], iface, db_path: Optional[str] = None) -> int:
+def sync_nodes_from_interface(
+    node_database_number: Union[int, str], iface, db_path: Optional[str] = None, *, background: bool = False
+) -> int:
     """Download the connected device's NodeDB and merge it into the local DB.
 
-    Returns the number of node entries ingested.
+    Returns the number of node entries ingested. With background=True the
+    snapshot is taken now but written by the background writer.
     """
     nodes = _extract_nodes_from_interface(iface)
     if not nodes:
         return 0
-    NodeDB(node_database_number, db_path).init_from_interface_nodes(nodes)
+    ndb = _db(NodeDB, node_database_number, db_path)
+    if background:
+        _WRITER.submit(ndb.init_from_interface_nodes, nodes)
+    else:
+        ndb.init_from_interface_nodes(nodes)
     return len(nodes)
 
 
@@ -1234,59 +1800,65 @@ def sync_nodes_from_interface(node_database_number: Union[int, str], iface, db_p
 # ------------------------------
 
 
-def _port_matches(port: object, *candidates: object) -> bool:
-    """Return True if decoded.portnum matches any known candidate.
-    Accepts names (str) or raw ints from older/newer libs.
-    """
-    return port in candidates
+# decoded.portnum values per packet type: names (str) or raw ints from older/newer libs.
+_NODEINFO_PORTS = frozenset(("NODEINFO_APP", 4))
+_POSITION_PORTS = frozenset(("POSITION_APP", 3))
+_TELEMETRY_PORTS = frozenset(("TELEMETRY_APP", 67))
+_TEXT_MESSAGE_PORTS = frozenset(("TEXT_MESSAGE_APP", "1"))
 
 
-def handle_packet(
+def _store_packet(
     packet: Dict[str, object], *, node_database_number: Union[int, str], db_path: Optional[str] = None
 ) -> Dict[str, bool]:
-    """Persist known Meshtastic packet types into the owner's DB.
-
-    Returns a dict of what was stored, e.g. {"nodeinfo": True, "position": False, "telemetry": True}.
-    """
     stored = {"nodeinfo": False, "position": False, "telemetry": False, "message": False, "touched_last_heard": False}
 
     try:
-        decoded = packet.get("decoded", {}) or {}
-        port = decoded.get("portnum")
-
-        # Always update last_heard (and SNR if provided)
-        try:
-            NodeDB(node_database_number, db_path).upsert(
-                node_num=packet.get("from"),
-                last_heard=packet.get("rxTime"),
-                snr=packet.get("snr"),
-            )
-            stored["touched_last_heard"] = True
-        except Exception:
-            pass
-
-        # NODEINFO
-        if _port_matches(port, "NODEINFO_APP", 4):
-            maybe_store_nodeinfo_in_db(packet, node_database_number=node_database_number, db_path=db_path)
-            stored["nodeinfo"] = True
-
-        # POSITION
-        if _port_matches(port, "POSITION_APP", 3) or ("position" in decoded):
-            if store_location_packet(packet, node_database_number=node_database_number, db_path=db_path) is not None:
-                stored["position"] = True
-
-        # TELEMETRY
-        if _port_matches(port, "TELEMETRY_APP", 67) or ("telemetry" in decoded):
-            if store_telemetry_packet(packet, node_database_number=node_database_number, db_path=db_path) is not None:
-                stored["telemetry"] = True
-
-        # TEXT MESSAGE
-        if _port_matches(port, "TEXT_MESSAGE_APP", "1") or ("text" in decoded):
-            if (
-                store_text_message_packet(packet, node_database_number=node_database_number, db_path=db_path)
-                is not None
-            ):
-                stored["message"] = True
+        # One transaction for everything this packet writes (or the writer's batch, when queued).
+        with _write_batch():
+            decoded = packet.get("decoded", {}) or {}
+            port = decoded.get("portnum")
+
+            # Always update last_heard (and SNR if provided)
+            try:
+                _db(NodeDB, node_database_number, db_path).touch(
+                    node_num=packet.get("from"),
+                    last_heard=packet.get("rxTime"),
+                    snr=packet.get("snr"),
+                )
+                stored["touched_last_heard"] = True
+            except Exception:
+                pass
+            if not decoded:
+                return stored
+
+            # NODEINFO
+            if port in _NODEINFO_PORTS:
+                maybe_store_nodeinfo_in_db(packet, node_database_number=node_database_number, db_path=db_path)
+                stored["nodeinfo"] = True
+
+            # POSITION
+            if port in _POSITION_PORTS or ("position" in decoded):
+                if (
+                    store_location_packet(packet, node_database_number=node_database_number, db_path=db_path)
+                    is not None
+                ):
+                    stored["position"] = True
+
+            # TELEMETRY
+            if port in _TELEMETRY_PORTS or ("telemetry" in decoded):
+                if (
+                    store_telemetry_packet(packet, node_database_number=node_database_number, db_path=db_path)
+                    is not None
+                ):
+                    stored["telemetry"] = True
+
+            # TEXT MESSAGE
+            if port in _TEXT_MESSAGE_PORTS or ("text" in decoded):
+                if (
+                    store_text_message_packet(packet, node_database_number=node_database_number, db_path=db_path)
+                    is not None
+                ):
+                    stored["message"] = True
 
     except Exception as e:
         logging.error(f"handle_packet error: {e}")
@@ -1294,6 +1866,88 @@ def handle_packet(
     return stored
 
 
+class _BackgroundWriter:
+    """Single background thread that runs queued DB writes in batched transactions.
+
+    The worker drains up to `max_batch` jobs, or whatever arrives within
+    `max_delay` seconds of the first one, and runs them under a single commit
+    per database file. One worker keeps SQLite's single-writer model intact.
+    """
+
+    def __init__(self, max_batch: int = 256, max_delay: float = 0.05):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: "queue.Queue[Tuple]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="meshdb-writer", daemon=True)
+                self._thread.start()
+        self._queue.put((fn, args, kwargs))
+
+    def join(self) -> None:
+        """Block until every queued job has run."""
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                with _write_batch():
+                    for fn, args, kwargs in batch:
+                        try:
+                            fn(*args, **kwargs)
+                        except Exception as e:
+                            logging.error(f"background write {getattr(fn, '__name__', fn)} failed: {e}")
+            except Exception as e:
+                logging.error(f"background writer error: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+_WRITER = _BackgroundWriter()
+atexit.register(_WRITER.join)
+
+
+def handle_packet(
+    packet: Dict[str, object],
+    *,
+    node_database_number: Union[int, str],
+    db_path: Optional[str] = None,
+    flush: bool = True,
+) -> Dict[str, bool]:
+    """Persist known Meshtastic packet types into the owner's DB.
+
+    Returns a dict of what was stored, e.g. {"nodeinfo": True, "position": False, "telemetry": True}.
+
+    With flush=False the packet is queued for a background writer that commits
+    queued packets in batches, and the call returns immediately with
+    {"queued": True}. Use flush_packets() to wait for queued writes.
+    """
+    if not flush:
+        _WRITER.submit(_store_packet, packet, node_database_number=node_database_number, db_path=db_path)
+        return {"queued": True}
+    return _store_packet(packet, node_database_number=node_database_number, db_path=db_path)
+
+
+def flush_packets() -> None:
+    """Block until every queued write (handle_packet(..., flush=False), background syncs) is done."""
+    _WRITER.join()
+
+
 # ------------------------------
 # Convenience accessors for names
 # ------------------------------
@@ -1302,10 +1956,10 @@ def handle_packet(
 def get_long_name(
     node_num: Union[int, str], *, node_database_number: Union[int, str], db_path: Optional[str] = None
 ) -> str:
-    return NodeDB(node_database_number, db_path).get_name(int(node_num), kind="long")
+    return _db(NodeDB, node_database_number, db_path).get_name(int(node_num), kind="long")
 
 
 def get_short_name(
     node_num: Union[int, str], *, node_database_number: Union[int, str], db_path: Optional[str] = None
 ) -> str:
-    return NodeDB(node_database_number, db_path).get_name(int(node_num), kind="short")
+    return _db(NodeDB, node_database_number, db_path).get_name(int(node_num), kind="short")
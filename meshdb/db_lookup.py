@@ -1,14 +1,16 @@
-import re
-from typing import List, Optional, Union
+import functools
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from .db_handler import NodeDB, LocationDB, TelemetryDB
-from .utils import decimal_to_hex, hex_to_decimal
+from .utils import decimal_to_hex
 
 Identifier = Union[int, str]
 ReturnType = Union[int, List[int], None]
 
-_HEX_RE = re.compile(r"^[!]?([0-9a-fA-F]{3,16})$")
-_HEX_SUFFIX_RE = re.compile(r"([0-9a-fA-F]{3,8})$")
+_HEX_DIGITS = "0123456789abcdefABCDEF"
+# Shorter names only match exactly; a one- or two-letter substring hits most of the mesh.
+_MIN_LIKE_LEN = 3
 
 
 def _is_int(value: Identifier) -> bool:
@@ -17,61 +19,67 @@ def _is_int(value: Identifier) -> bool:
 
 def _maybe_hex_chunk(text: str) -> Optional[str]:
     """Return a hex-like chunk if the input looks like hex (with or without '!')."""
-    m = _HEX_RE.match(text.strip())
-    if m:
-        return m.group(1).lower()
-    m = _HEX_SUFFIX_RE.search(text.strip())
-    return m.group(1).lower() if m else None
+    text = text.strip()
+    # Whole identifier is 3-16 hex digits, optionally prefixed with '!'
+    body = text[1:] if text[:1] == "!" else text
+    if 3 <= len(body) <= 16 and not body.strip(_HEX_DIGITS):
+        return body.lower()
+    # Otherwise the trailing run of hex digits, capped at 8; rstrip does the scan in C
+    run = len(text) - len(text.rstrip(_HEX_DIGITS))
+    return text[-min(run, 8) :].lower() if run >= 3 else None
 
 
-def _query_all_node_nums(ndb: NodeDB) -> List[int]:
+def _query_by_hex_suffix(ndb: NodeDB, suffix_hex: str) -> List[int]:
+    """Return node_nums whose decimal_to_hex() form ends with `suffix_hex`.
+
+    A hex suffix of L digits is the low 4*L bits, so SQLite tests it as a bitmask
+    instead of shipping every node_num to Python.
+    """
+    digits = len(suffix_hex)
+    if digits > 15:  # the whole 64-bit value; the exact lookup already covers it
+        return []
+    sql = f"SELECT node_num FROM {ndb.table} WHERE (node_num & ?) = ?"
+    params: List[int] = [(1 << (4 * digits)) - 1, int(suffix_hex, 16)]
+    if digits > 8:
+        # decimal_to_hex pads to 8 digits; a longer suffix also needs that many digits
+        sql += " AND CAST(node_num AS INTEGER) >= ?"
+        params.append(16 ** (digits - 1))
     ndb.ensure_table()
-    with ndb.connect() as con:
+    with ndb.borrow(read_only=True) as con:
         cur = con.cursor()
-        cur.execute(f"SELECT node_num FROM {ndb.table}")
+        cur.execute(sql, params)
         out: List[int] = []
-        for (val,) in cur.fetchall():
+        for (val,) in cur:
             try:
                 out.append(int(val))
-            except Exception:
-                try:
-                    out.append(int(str(val)))
-                except Exception:
-                    continue
+            except (TypeError, ValueError):
+                continue
         return out
 
 
-def _match_by_hex_suffix(candidates: List[int], suffix_hex: str) -> List[int]:
-    suffix_hex = suffix_hex.lower()
-    hits: List[int] = []
-    for num in candidates:
-        hx = decimal_to_hex(num)[1:].lower()  # strip leading '!'
-        if hx.endswith(suffix_hex):
-            hits.append(num)
-    return hits
-
-
 def _query_by_name(ndb: NodeDB, name: str) -> List[int]:
     ndb.ensure_table()
-    with ndb.connect() as con:
+    with ndb.borrow(read_only=True) as con:
         cur = con.cursor()
-        # Exact (case-insensitive) on short or long name
+        # Exact (case-insensitive) on short or long name; a UNION of two equalities lets
+        # each side use its NOCASE index, where an OR across both columns scans the table.
         cur.execute(
-            f"SELECT node_num FROM {ndb.table} " "WHERE short_name = ? COLLATE NOCASE OR long_name = ? COLLATE NOCASE",
+            f"SELECT node_num FROM {ndb.table} WHERE short_name = ? COLLATE NOCASE "
+            f"UNION SELECT node_num FROM {ndb.table} WHERE long_name = ? COLLATE NOCASE",
             (name, name),
         )
-        rows = [int(r[0]) for r in cur.fetchall()]
-        if rows:
+        rows = [int(r[0]) for r in cur]
+        if rows or len(name) < _MIN_LIKE_LEN:
             return rows
-        # Fallback: substring match (case-insensitive)
-        like = f"%{name}%"
+        # Fallback: substring match (case-insensitive), with LIKE wildcards in the input taken literally
+        like = "%" + name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
         cur.execute(
             f"SELECT node_num FROM {ndb.table} "
             "WHERE short_name LIKE ? ESCAPE '\\' COLLATE NOCASE "
             "OR long_name LIKE ? ESCAPE '\\' COLLATE NOCASE",
             (like, like),
         )
-        return [int(r[0]) for r in cur.fetchall()]
+        return [int(r[0]) for r in cur]
 
 
 def get_node_num(
@@ -91,46 +99,124 @@ def get_node_num(
       - list[int] if multiple matches
       - None if no matches
     """
-    ndb = NodeDB(owner_node_num, db_path)
+    nums = _resolve_to_list(identifier, owner_node_num=owner_node_num, db_path=db_path)
+    if not nums:
+        return None
+    return nums[0] if len(nums) == 1 else nums
 
-    # 1) Already numeric
-    if _is_int(identifier):
-        return int(identifier)
 
-    text = str(identifier).strip()
+def _exact_hex_hit(ndb: NodeDB, chunk: str) -> Optional[int]:
+    """Return the node_num spelled by `chunk` if that node exists, else None."""
+    try:
+        exact_num = int(chunk, 16)
+        ndb.ensure_table()
+        with ndb.borrow(read_only=True) as con:
+            cur = con.cursor()
+            cur.execute(f"SELECT 1 FROM {ndb.table} WHERE node_num = ? LIMIT 1", (exact_num,))
+            if cur.fetchone():
+                return exact_num
+    except Exception:
+        pass
+    return None
+
+
+def _resolve_text(ndb: NodeDB, text: str) -> List[int]:
+    """Every node_num a non-numeric identifier resolves to, uncached."""
+    chunk = _maybe_hex_chunk(text)
+    # A full '!xxxxxxxx' id is checked as an id before names; it only reaches the
+    # name query (and its substring fallback) when no such node exists.
+    checked_exact = len(text) == 9 and text[0] == "!" and chunk is not None and len(chunk) == 8
+    if checked_exact:
+        exact_num = _exact_hex_hit(ndb, chunk)
+        if exact_num is not None:
+            return [exact_num]
 
     # 2) Exact match by names (short/long)
     name_hits = _query_by_name(ndb, text)
-    if len(name_hits) == 1:
-        return name_hits[0]
-    if len(name_hits) > 1:
+    if name_hits:
         return name_hits
 
     # 3) Hex-like (exact or suffix)
-    chunk = _maybe_hex_chunk(text)
     if chunk:
         # Try exact hex → decimal first
-        try:
-            exact_num = hex_to_decimal("!" + chunk)
-            # confirm it exists
-            ndb.ensure_table()
-            with ndb.connect() as con:
-                cur = con.cursor()
-                cur.execute(f"SELECT 1 FROM {ndb.table} WHERE node_num = ? LIMIT 1", (exact_num,))
-                if cur.fetchone():
-                    return exact_num
-        except Exception:
-            pass
+        if not checked_exact:
+            exact_num = _exact_hex_hit(ndb, chunk)
+            if exact_num is not None:
+                return [exact_num]
 
         # Suffix search over all known nodes
-        nums = _query_all_node_nums(ndb)
-        suffix_hits = _match_by_hex_suffix(nums, chunk)
-        if len(suffix_hits) == 1:
-            return suffix_hits[0]
-        if len(suffix_hits) > 1:
-            return suffix_hits
+        return _query_by_hex_suffix(ndb, chunk)
 
     # 4) No matches
+    return []
+
+
+def _collapse(hits: Dict[Any, List[int]]) -> Dict[Any, ReturnType]:
+    return {key: nums[0] if len(nums) == 1 else nums for key, nums in hits.items()}
+
+
+def build_name_index(owner_node_num: Union[int, str], db_path: Optional[str] = None) -> Dict[Any, ReturnType]:
+    """
+    Load every known node once and index it by each identifier form get_node_num accepts.
+
+    Keys:
+      - int node number
+      - lowercased short and long names
+      - lowercased hex id with and without '!', plus every 3-8 digit hex suffix
+      - ("hex", key) for each of those hex keys, never shadowed by names
+
+    Values follow get_node_num: an int for a unique match, a list[int] when ambiguous.
+    A hex key that spells an existing node's id maps to that node alone. Names
+    shadow the plain hex keys; lookup_node_num() reads hex chunks through the
+    ("hex", key) entries, matching get_node_num's order ('!xxxxxxxx' ids, then
+    names, then exact hex, then hex suffixes). Use
+    lookup_node_num() to resolve identifiers against the index; substring name
+    matches are not indexed.
+    """
+    ndb = NodeDB(owner_node_num, db_path)
+    ndb.ensure_table()
+    names: Dict[Any, List[int]] = {}
+    ids: Dict[Any, List[int]] = {}
+    hexes: Dict[Any, List[int]] = {}
+    with ndb.borrow(read_only=True) as con:
+        cur = con.cursor()
+        cur.execute(f"SELECT node_num, long_name, short_name FROM {ndb.table}")
+        for node_num, long_name, short_name in cur:
+            try:
+                num = int(node_num)
+            except (TypeError, ValueError):
+                continue
+            for name in {n.lower() for n in (long_name, short_name) if n}:
+                names.setdefault(name, []).append(num)
+            hx = f"{num:08x}"  # decimal_to_hex() without the '!', already lowercase
+            ids.setdefault(num, []).append(num)
+            ids.setdefault("!" + hx, []).append(num)
+            for size in range(3, min(len(hx), 8) + 1):
+                hexes.setdefault(hx[-size:], []).append(num)
+            if len(hx) > 8:
+                hexes.setdefault(hx, []).append(num)
+    # Exact hex before suffix: a key that parses to a known node number names that node
+    exact = {key: ids[int(key, 16)] for key in hexes if int(key, 16) in ids}
+    by_hex = _collapse(hexes)
+    by_hex.update(_collapse(exact))
+    index = dict(by_hex)
+    index.update(_collapse(names))
+    index.update(_collapse(ids))
+    index.update({("hex", key): hit for key, hit in by_hex.items()})
+    return index
+
+
+def lookup_node_num(index: Dict[Any, ReturnType], identifier: Identifier) -> ReturnType:
+    """Resolve `identifier` against a build_name_index() result, in get_node_num's order."""
+    if _is_int(identifier):
+        return int(identifier)
+    text = str(identifier).strip()
+    hit = index.get(text.lower())
+    if hit is not None:
+        return hit
+    chunk = _maybe_hex_chunk(text)
+    if chunk:
+        return index.get(("hex", chunk))
     return None
 
 
@@ -138,27 +224,47 @@ def get_node_num(
 # Snapshot helpers
 # ------------------------------
 
-from typing import Dict, Any
 
+# Non-empty get_node_num results per thread and file:
+# {db_path: (token, {(table, text): node_nums})}.
+# The token from NodeDB.data_version changes whenever any other connection, in this
+# process or another one, commits to the file, and that drops the file's entries.
+_RESOLVED = threading.local()
+_RESOLVED_MAX = 1024
 
-def _fetch_one_as_dict(con, query: str, params: tuple) -> Optional[Dict[str, Any]]:
-    cur = con.cursor()
-    cur.execute(query, params)
-    row = cur.fetchone()
-    if not row:
-        return None
-    cols = [d[0] for d in cur.description]
-    return {c: row[i] for i, c in enumerate(cols)}
+
+def _resolved_cache(ndb: NodeDB) -> Dict[Tuple[str, str], Tuple[int, ...]]:
+    files = getattr(_RESOLVED, "files", None)
+    if files is None:
+        files = _RESOLVED.files = {}
+    token = ndb.data_version()
+    if token is None:
+        files.pop(ndb.db_path, None)
+        return {}  # uncached this time
+    entry = files.get(ndb.db_path)
+    if entry is None or entry[0] != token or len(entry[1]) >= _RESOLVED_MAX:
+        entry = files[ndb.db_path] = (token, {})
+    return entry[1]
 
 
 def _resolve_to_list(identifier: Identifier, *, owner_node_num: Union[int, str], db_path: Optional[str]) -> List[int]:
-    """Resolve any identifier to a list of node_nums (possibly empty)."""
-    hit = get_node_num(identifier, owner_node_num=owner_node_num, db_path=db_path)
+    """Resolve any identifier to a list of node_nums (possibly empty); get_node_num adapts this form."""
+    # 1) Already numeric
+    if _is_int(identifier):
+        return [int(identifier)]
+
+    ndb = NodeDB(owner_node_num, db_path)
+    ndb.ensure_table()
+    text = str(identifier).strip()
+    cache = _resolved_cache(ndb)
+    key = (ndb.table, text)
+    hit = cache.get(key)
     if hit is None:
-        return []
-    if isinstance(hit, list):
-        return hit
-    return [int(hit)]
+        hit = tuple(_resolve_text(ndb, text))
+        # Misses are not kept: a node that shows up later must be found right away
+        if hit:
+            cache[key] = hit
+    return list(hit)
 
 
 def get_nodeinfo(
@@ -170,75 +276,13 @@ def get_nodeinfo(
     nums = _resolve_to_list(identifier, owner_node_num=owner_node_num, db_path=db_path)
     if not nums:
         return None
-    out: List[Dict[str, Any]] = []
-    with ndb.connect() as con:
-        for num in nums:
-            row = _fetch_one_as_dict(con, f"SELECT * FROM {ndb.table} WHERE node_num = ?", (num,))
-            if row:
-                out.append(row)
+    by_node = ndb.rows_for_nodes(nums)
+    out = [by_node[num] for num in nums if num in by_node]
     if not out:
         return None
     return out[0] if len(out) == 1 else out
 
 
-def _latest_location_dict(
-    owner_node_num: Union[int, str], num: int, db_path: Optional[str]
-) -> Optional[Dict[str, Any]]:
-    ldb = LocationDB(owner_node_num, db_path)
-    ldb.ensure_table()
-    with ldb.connect() as con:
-        return _fetch_one_as_dict(
-            con,
-            f"SELECT * FROM {ldb.table} WHERE node_num = ? ORDER BY timestamp DESC LIMIT 1",
-            (num,),
-        )
-
-
-def _latest_telem_dicts(
-    owner_node_num: Union[int, str], num: int, db_path: Optional[str]
-) -> Dict[str, Dict[str, Any]]:
-    tdb = TelemetryDB(owner_node_num, db_path)
-    tdb.ensure_tables()
-    out: Dict[str, Dict[str, Any]] = {}
-    with tdb.connect() as con:
-        dev = _fetch_one_as_dict(
-            con, f"SELECT * FROM {tdb.table_device} WHERE node_num = ? ORDER BY timestamp DESC LIMIT 1", (num,)
-        )
-        if dev:
-            out["device"] = dev
-        pwr = _fetch_one_as_dict(
-            con, f"SELECT * FROM {tdb.table_power} WHERE node_num = ? ORDER BY timestamp DESC LIMIT 1", (num,)
-        )
-        if pwr:
-            out["power"] = pwr
-        env = _fetch_one_as_dict(
-            con, f"SELECT * FROM {tdb.table_environment} WHERE node_num = ? ORDER BY timestamp DESC LIMIT 1", (num,)
-        )
-        if env:
-            out["environment"] = env
-        aq = _fetch_one_as_dict(
-            con, f"SELECT * FROM {tdb.table_air_quality} WHERE node_num = ? ORDER BY timestamp DESC LIMIT 1", (num,)
-        )
-        if aq:
-            out["air_quality"] = aq
-        ls = _fetch_one_as_dict(
-            con, f"SELECT * FROM {tdb.table_local_stats} WHERE node_num = ? ORDER BY timestamp DESC LIMIT 1", (num,)
-        )
-        if ls:
-            out["local_stats"] = ls
-        hl = _fetch_one_as_dict(
-            con, f"SELECT * FROM {tdb.table_health} WHERE node_num = ? ORDER BY timestamp DESC LIMIT 1", (num,)
-        )
-        if hl:
-            out["health"] = hl
-        host = _fetch_one_as_dict(
-            con, f"SELECT * FROM {tdb.table_host} WHERE node_num = ? ORDER BY timestamp DESC LIMIT 1", (num,)
-        )
-        if host:
-            out["host"] = host
-    return out
-
-
 def get_node(
     identifier: Identifier, *, owner_node_num: Union[int, str], db_path: Optional[str] = None
 ) -> Union[Dict[str, Any], List[Dict[str, Any]], None]:
@@ -250,28 +294,80 @@ def get_node(
 
     Keys omitted when not available; e.g. no telemetry → no 'telemetry' key.
     """
+    snapshots = list(iter_nodes(identifier, owner_node_num=owner_node_num, db_path=db_path))
+    if not snapshots:
+        return None
+    return snapshots[0] if len(snapshots) == 1 else snapshots
+
+
+# Nodes per iter_nodes() round of table reads
+_SNAPSHOT_CHUNK = 999
+
+
+def iter_nodes(
+    identifier: Identifier, *, owner_node_num: Union[int, str], db_path: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """Yield get_node()'s snapshots one node at a time.
+
+    Tables are read one chunk of nodes at a time, so only that chunk's rows are
+    held in memory while its snapshots are consumed.
+    """
     nums = _resolve_to_list(identifier, owner_node_num=owner_node_num, db_path=db_path)
     if not nums:
-        return None
+        return
 
-    snapshots: List[Dict[str, Any]] = []
     ndb = NodeDB(owner_node_num, db_path)
-    ndb.ensure_table()
-    with ndb.connect() as con:
-        for num in nums:
-            nodeinfo = _fetch_one_as_dict(con, f"SELECT * FROM {ndb.table} WHERE node_num = ?", (num,))
+    ldb = LocationDB(owner_node_num, db_path)
+    tdb = TelemetryDB(owner_node_num, db_path)
+    for start in range(0, len(nums), _SNAPSHOT_CHUNK):
+        chunk = nums[start : start + _SNAPSHOT_CHUNK]
+        # One query per table for the chunk, then assembled per node
+        nodeinfo = ndb.rows_for_nodes(chunk)
+        positions = ldb.latest_for_nodes(chunk)
+        telemetry = tdb.latest_for_nodes(chunk)
+        for num in chunk:
             snap: Dict[str, Any] = {"node_num": num}
-            if nodeinfo:
-                snap["nodeinfo"] = nodeinfo
-            loc = _latest_location_dict(owner_node_num, num, db_path)
-            if loc:
-                snap["position"] = loc
-            telem = _latest_telem_dicts(owner_node_num, num, db_path)
+            if num in nodeinfo:
+                snap["nodeinfo"] = nodeinfo[num]
+            if num in positions:
+                snap["position"] = positions[num]
+            telem = {subtype: rows[num] for subtype, rows in telemetry.items() if num in rows}
             if telem:
                 snap["telemetry"] = telem
-            snapshots.append(snap)
+            yield snap
+
+
+_METRIC_TELEMETRY_ORDER = ("device", "power", "environment", "air_quality", "local_stats", "health", "host")
+_METRIC_ALIASES = {
+    "hardware_model": "hw_model",
+    "longName": "long_name",
+    "shortName": "short_name",
+    "isLicensed": "is_licensed",
+    "isUnmessagable": "is_unmessagable",
+    "lastHeard": "last_heard",
+    "hopsAway": "hops_away",
+}
+_METRIC_NODEDB_COLS = frozenset(
+    (
+        "long_name",
+        "short_name",
+        "macaddr",
+        "hw_model",
+        "role",
+        "is_licensed",
+        "public_key",
+        "is_unmessagable",
+        "last_heard",
+        "hops_away",
+        "snr",
+    )
+)
 
-    return snapshots[0] if len(snapshots) == 1 else snapshots
+
+@functools.lru_cache(maxsize=1024)
+def _latest_values_sql(table: str, columns: Tuple[str, ...]) -> str:
+    # `columns` are always names read from the table's own schema
+    return f"SELECT {', '.join(columns)} FROM {table} WHERE node_num = ? ORDER BY timestamp DESC LIMIT 1"
 
 
 def get_node_metric(
@@ -287,76 +383,70 @@ def get_node_metric(
 
     Returns a single scalar value or None.
     """
+    return get_node_metrics(identifier, [metric], owner_node_num=owner_node_num, db_path=db_path)[metric]
+
+
+def get_node_metrics(
+    identifier: Identifier, metrics: Iterable[str], *, owner_node_num: Union[int, str], db_path: Optional[str] = None
+) -> Dict[str, Optional[Union[int, float, str]]]:
+    """
+    Return {metric: value} for several fields of one node, resolved as get_node_metric() does.
+
+    Issues one query per telemetry table that has any of the metrics, plus at most
+    one NodeInfo query, instead of one lookup per metric. Missing metrics map to None.
+    """
+    out: Dict[str, Optional[Union[int, float, str]]] = dict.fromkeys(metrics)
     # Resolve identifier → single node_num (first match wins)
     nums = _resolve_to_list(identifier, owner_node_num=owner_node_num, db_path=db_path)
-    if not nums:
-        return None
+    if not nums or not out:
+        return out
     num = nums[0]
 
-    # 1) Try telemetry first
-    telem = _latest_telem_dicts(owner_node_num, num, db_path)
-    if telem:
-        for subtype in (
-            "device",
-            "power",
-            "environment",
-            "air_quality",
-            "local_stats",
-            "health",
-            "host",
-        ):
-            row = telem.get(subtype)
-            if not row:
+    # 1) Try telemetry first; each table that has any requested column is read once
+    tdb = TelemetryDB(owner_node_num, db_path)
+    tdb.ensure_tables()
+    pending = set(out)
+    with tdb.borrow(read_only=True) as con:
+        cur = con.cursor()
+        for subtype in _METRIC_TELEMETRY_ORDER:
+            table = tdb.tables[subtype]
+            wanted = tuple(c for c in tdb.columns[table] if c in pending)
+            if not wanted:
                 continue
-            if metric in row:
-                return row.get(metric)
+            cur.execute(_latest_values_sql(table, wanted), (num,))
+            row = cur.fetchone()
+            if row:
+                out.update(zip(wanted, row))
+                pending.difference_update(wanted)
+    if not pending:
+        return out
 
     # 2) Fallback to NodeInfo table
-    # Normalize metric name and handle common aliases
-    aliases = {
-        "hardware_model": "hw_model",
-        "longName": "long_name",
-        "shortName": "short_name",
-        "isLicensed": "is_licensed",
-        "isUnmessagable": "is_unmessagable",
-        "lastHeard": "last_heard",
-        "hopsAway": "hops_away",
-    }
-    col = aliases.get(metric, metric)
-
-    # Special-case synthetic IDs
-    if col in ("id", "node_id"):
-        try:
-            return decimal_to_hex(num)
-        except Exception:
-            return None
-
-    # Only allow known safe NodeDB columns
-    allowed_nodedb_cols = {
-        "long_name",
-        "short_name",
-        "macaddr",
-        "hw_model",
-        "role",
-        "is_licensed",
-        "public_key",
-        "is_unmessagable",
-        "last_heard",
-        "hops_away",
-        "snr",
-    }
-    if col not in allowed_nodedb_cols:
-        return None
+    # Normalize metric names and handle common aliases
+    cols: Dict[str, str] = {}
+    for metric in pending:
+        col = _METRIC_ALIASES.get(metric, metric)
+        # Special-case synthetic IDs
+        if col in ("id", "node_id"):
+            out[metric] = decimal_to_hex(num)
+        # Only allow known safe NodeDB columns
+        elif col in _METRIC_NODEDB_COLS:
+            cols[metric] = col
+    if not cols:
+        return out
 
     ndb = NodeDB(owner_node_num, db_path)
     ndb.ensure_table()
+    selected = sorted(set(cols.values()))
     try:
-        with ndb.connect() as con:
+        with ndb.borrow(read_only=True) as con:
             cur = con.cursor()
-            cur.execute(f"SELECT {col} FROM {ndb.table} WHERE node_num = ? LIMIT 1", (num,))
+            cur.execute(f"SELECT {', '.join(selected)} FROM {ndb.table} WHERE node_num = ? LIMIT 1", (num,))
             row = cur.fetchone()
-            if row is None:
-                return None
-            return row[0]
     except Exception:
-        return None
+        return out
+    if row is not None:
+        values = dict(zip(selected, row))
+        for metric, col in cols.items():
+            out[metric] = values[col]
+    return out
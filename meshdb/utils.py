@@ -4,9 +4,7 @@ def decimal_to_hex(decimal_number):
 
 def hex_to_decimal(hex_string: str) -> int:
     """Convert a Meshtastic-style hex string like '!deadbeef' back to an integer."""
-    if hex_string.startswith("!"):
-        hex_string = hex_string[1:]
-    return int(hex_string, 16)
+    return int(hex_string.removeprefix("!"), 16)
 
 
 def convert_to_camel_case(string):
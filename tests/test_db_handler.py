@@ -0,0 +1,215 @@
+import contextlib
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+import meshdb
+from meshdb import NodeDB, db_handler
+
+OWNER = 1
+NODE = 0x1ADC
+
+
+class TempDBTestCase(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        # Cleanups run last-in first-out: close pooled connections before removing the files
+        self.addCleanup(db_handler._close_idle)
+        self.db_path = tmp.name
+        self.ndb = NodeDB(OWNER, self.db_path)
+
+
+class NameCacheTest(TempDBTestCase):
+    def test_rename_during_lookup_is_not_cached(self):
+        self.ndb.upsert(NODE, long_name="Alpha")
+        borrow = self.ndb.borrow
+
+        @contextlib.contextmanager
+        def borrow_then_rename(read_only=False):
+            with borrow(read_only) as con:
+                yield con
+            # Lands after get_name has read the old row but before it caches it
+            self.ndb.upsert(NODE, long_name="Beta")
+
+        with mock.patch.object(self.ndb, "borrow", borrow_then_rename):
+            self.assertEqual(self.ndb.get_name(NODE), "Alpha")
+        self.assertEqual(self.ndb.get_name(NODE), "Beta")
+
+    def test_rename_from_another_connection(self):
+        self.ndb.upsert(NODE, long_name="Alpha")
+        self.assertEqual(self.ndb.get_name(NODE), "Alpha")
+        con = self.ndb.connect()
+        with con:
+            con.execute(f"UPDATE {self.ndb.table} SET long_name = 'Beta' WHERE node_num = ?", (NODE,))
+        con.close()
+        self.assertEqual(self.ndb.get_name(NODE), "Beta")
+
+
+PACKETS = [
+    {
+        "from": 0x11111111,
+        "rxTime": 1700000000,
+        "snr": 5.5,
+        "decoded": {"portnum": "NODEINFO_APP", "user": {"longName": "Alpha", "shortName": "ALPH"}},
+    },
+    {
+        "from": 0x22222222,
+        "rxTime": 1700000100,
+        "decoded": {"portnum": "POSITION_APP", "position": {"latitude": 45.5, "longitude": -122.6}},
+    },
+    {
+        "from": 0x11111111,
+        "rxTime": 1700000200,
+        "decoded": {"portnum": "TELEMETRY_APP", "telemetry": {"deviceMetrics": {"batteryLevel": 90, "voltage": 4.1}}},
+    },
+    {
+        "from": 0x22222222,
+        "rxTime": 1700000300,
+        "snr": 2.25,
+        "decoded": {"portnum": "TEXT_MESSAGE_APP", "text": "hello", "channel": 0},
+    },
+    {
+        "from": 0x11111111,
+        "rxTime": 1700000400,
+        "decoded": {"portnum": "POSITION_APP", "position": {"latitude": 45.1, "longitude": -122.1}},
+    },
+]
+
+
+def _dump(db_path):
+    """Every row of every table in the file, in a stable order."""
+    con = sqlite3.connect(db_path)
+    try:
+        tables = [row[0] for row in con.execute("SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name")]
+        return {table: sorted(map(repr, con.execute(f'SELECT * FROM "{table}"'))) for table in tables}
+    finally:
+        con.close()
+
+
+class WritePathTest(TempDBTestCase):
+    def _touched(self, node_num):
+        return self.ndb.rows_for_nodes([node_num]).get(node_num)
+
+    def test_queued_ingest_matches_synchronous(self):
+        queued_dir = os.path.join(self.db_path, "queued")
+        os.mkdir(queued_dir)
+        for packet in PACKETS:
+            meshdb.handle_packet(packet, node_database_number=OWNER, db_path=self.db_path)
+            self.assertEqual(
+                meshdb.handle_packet(packet, node_database_number=OWNER, db_path=queued_dir, flush=False),
+                {"queued": True},
+            )
+        meshdb.flush_packets()
+        self.assertEqual(_dump(NodeDB(OWNER, queued_dir).db_path), _dump(self.ndb.db_path))
+
+    def test_flush_packets_drains_the_queue(self):
+        nodes = range(NODE, NODE + 300)
+        for i, node_num in enumerate(nodes):
+            packet = {
+                "from": node_num,
+                "rxTime": 1700000000 + i,
+                "decoded": {"portnum": "POSITION_APP", "position": {"latitude": 45.0, "longitude": -122.0}},
+            }
+            meshdb.handle_packet(packet, node_database_number=OWNER, db_path=self.db_path, flush=False)
+        meshdb.flush_packets()
+        self.assertEqual(db_handler._WRITER._queue.unfinished_tasks, 0)
+        self.assertEqual(len(meshdb.LocationDB(OWNER, self.db_path).latest_for_nodes(nodes)), 300)
+        self.assertEqual(len(self.ndb.rows_for_nodes(nodes)), 300)
+
+    def test_bad_row_is_dropped_alone(self):
+        with self.assertLogs(level="ERROR") as logs:
+            with db_handler._write_batch():
+                self.ndb.touch(1, last_heard=10)
+                self.ndb.touch(2, snr={"not": "bindable"})
+                self.ndb.touch(3, last_heard=30)
+        self.assertIn("Dropping row", logs.output[0])
+        self.assertEqual(sorted(self.ndb.rows_for_nodes([1, 2, 3])), [1, 3])
+        self.assertEqual(self._touched(3)["last_heard"], 30)
+
+    def test_bad_row_in_executemany(self):
+        self.ndb.ensure_table()
+        sql = db_handler._format_sql(NodeDB._UPSERT_SQL, self.ndb.table)
+        rows = [NodeDB._upsert_params(num, last_heard=num) for num in (4, 5, 6)]
+        rows[1] = NodeDB._upsert_params(5, last_heard=[5])
+        with self.ndb.transaction() as con, self.assertLogs(level="ERROR"):
+            db_handler._executemany_rows(con, sql, rows)
+        self.assertEqual(sorted(self.ndb.rows_for_nodes([4, 5, 6])), [4, 6])
+
+    def test_folded_touches_keep_non_null_values(self):
+        with db_handler._write_batch():
+            self.ndb.touch(NODE, last_heard=5, snr=1.5)
+            self.ndb.touch(NODE, last_heard=None, snr=None)
+            self.ndb.touch(NODE, last_heard=7)
+        row = self._touched(NODE)
+        self.assertEqual((row["last_heard"], row["snr"]), (7, 1.5))
+
+    def test_touch_keeps_stored_values(self):
+        self.ndb.touch(NODE, last_heard=5, snr=1.5)
+        with db_handler._write_batch():
+            self.ndb.touch(NODE, last_heard=9)
+        row = self._touched(NODE)
+        self.assertEqual((row["last_heard"], row["snr"]), (9, 1.5))
+
+
+class UpsertTest(TempDBTestCase):
+    def _row(self, node_num):
+        with self.ndb.borrow(read_only=True) as con:
+            cur = con.execute(f"SELECT * FROM {self.ndb.table} WHERE node_num = ?", (node_num,))
+            row = cur.fetchone()
+            return dict(zip([d[0] for d in cur.description], row)) if row else None
+
+    def test_insert_defaults(self):
+        self.ndb.upsert(NODE)
+        self.assertEqual(
+            self._row(NODE),
+            {
+                "node_num": str(NODE),
+                "long_name": "Meshtastic 1adc",
+                "short_name": "1adc",
+                "macaddr": "",
+                "hw_model": "UNSET",
+                "role": "CLIENT",
+                "is_licensed": 0,
+                "public_key": "",
+                "is_unmessagable": 0,
+                "last_heard": None,
+                "hops_away": None,
+                "snr": None,
+            },
+        )
+
+    def test_null_parameters_keep_stored_values(self):
+        self.ndb.upsert(
+            NODE, long_name="Alpha", short_name="ALPH", hw_model="TBEAM", is_licensed=True, last_heard=5, snr=1.5
+        )
+        self.ndb.upsert(NODE, role="ROUTER", hops_away=2)
+        row = self._row(NODE)
+        self.assertEqual(
+            (row["long_name"], row["short_name"], row["hw_model"], row["is_licensed"], row["last_heard"], row["snr"]),
+            ("Alpha", "ALPH", "TBEAM", 1, 5, 1.5),
+        )
+        self.assertEqual((row["role"], row["hops_away"]), ("ROUTER", 2))
+
+    def test_empty_string_overwrites_name(self):
+        self.ndb.upsert(NODE, long_name="Alpha", short_name="ALPH")
+        self.ndb.upsert(NODE, long_name="")
+        row = self._row(NODE)
+        self.assertEqual((row["long_name"], row["short_name"]), ("", "ALPH"))
+        # An empty stored name falls back to the hex id
+        self.assertEqual(self.ndb.get_name(NODE), "!00001adc")
+
+    def test_non_numeric_node_num(self):
+        self.ndb.upsert("abc", last_heard=5)
+        row = self._row("abc")
+        # No hex suffix to build default names from
+        self.assertEqual((row["long_name"], row["short_name"]), (None, None))
+        self.assertEqual((row["hw_model"], row["role"], row["last_heard"]), ("UNSET", "CLIENT", 5))
+        self.ndb.upsert("abc", short_name="ABC")
+        self.assertEqual((self._row("abc")["long_name"], self._row("abc")["short_name"]), (None, "ABC"))
+
+
+if __name__ == "__main__":
+    unittest.main()
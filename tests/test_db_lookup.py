@@ -0,0 +1,37 @@
+import tempfile
+import unittest
+
+import meshdb
+from meshdb import NodeDB, db_handler
+
+OWNER = 1
+
+
+class NameIndexTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        # Cleanups run last-in first-out: close pooled connections before removing the files
+        self.addCleanup(db_handler._close_idle)
+        self.db_path = tmp.name
+        ndb = NodeDB(OWNER, self.db_path)
+        # 0x1adc plus two nodes whose ids also end in 1adc; all three get the
+        # default short name "1adc", so names are loaded with the hex spelling too.
+        for num in (0x1ADC, 0x21ADC, 0x31ADC):
+            ndb.touch(num, last_heard=1)
+
+    def test_exact_hex_beats_suffix_matches(self):
+        index = meshdb.build_name_index(OWNER, self.db_path)
+        for identifier in ("!1adc", "01adc", "!00001adc"):
+            expected = meshdb.get_node_num(identifier, owner_node_num=OWNER, db_path=self.db_path)
+            self.assertEqual(expected, 0x1ADC)
+            self.assertEqual(meshdb.lookup_node_num(index, identifier), expected)
+
+    def test_suffix_without_exact_node_stays_ambiguous(self):
+        index = meshdb.build_name_index(OWNER, self.db_path)
+        # No node is 0xadc, so every id ending in adc matches
+        self.assertEqual(sorted(meshdb.lookup_node_num(index, "!adc")), [0x1ADC, 0x21ADC, 0x31ADC])
+
+
+if __name__ == "__main__":
+    unittest.main()